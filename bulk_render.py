@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Cisco DNA Center Jinja2 Templates Bulk Rendering
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2020 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import collections
+import csv
+import datetime
+import hashlib
+import itertools
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+import jinja2
+
+import dnac_apis
+from config import RENDER_TEMPLATE, RENDER_PARAMS_FILE, RENDER_OUTPUT_DIR, RENDER_CACHE_DIR
+from config import RENDER_WORKERS, RENDER_CHUNK_SIZE, RENDER_HASH_ONLY
+
+
+TEMPLATES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_worker_template = None  # the compiled template, loaded once by each render process
+
+
+def get_jinja_env(cache_dir=RENDER_CACHE_DIR):
+    """
+    Create the Jinja2 environment for the project templates, with the compiled templates bytecode saved to the folder
+    {cache_dir}, and reused by all processes and runs, as long as the template file is not changed
+    :param cache_dir: folder for the compiled templates bytecode
+    :return: Jinja2 environment
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    return jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+                              bytecode_cache=jinja2.FileSystemBytecodeCache(cache_dir),
+                              undefined=jinja2.StrictUndefined,
+                              keep_trailing_newline=True)
+
+
+def _init_worker(template_name, cache_dir):
+    """
+    Render process initializer, load the compiled template once per process
+    :param template_name: template file name
+    :param cache_dir: folder for the compiled templates bytecode
+    :return: none
+    """
+    global _worker_template
+    _worker_template = get_jinja_env(cache_dir).get_template(template_name)
+
+
+def config_file_name(output_dir, hostname):
+    """
+    Create the file name for the rendered config of the device {hostname}, in the folder {output_dir}.
+    The hostname is read from the parameters file, and it may not include a path.
+    :param output_dir: folder for the rendered configs
+    :param hostname: device hostname
+    :return: file name "{output_dir}/{hostname}.cfg"
+    """
+    if not hostname or '/' in hostname or '\\' in hostname:
+        raise ValueError('Invalid device hostname for a file name: ' + repr(hostname))
+    return os.path.join(output_dir, hostname + '.cfg')
+
+
+def _render_chunk(chunk, output_dir, hash_only):
+    """
+    Render the template for a chunk of devices, in a render process
+    :param chunk: list of devices [[device hostname, template parameters],...]
+    :param output_dir: folder for the rendered configs, or none
+    :param hash_only: do not save the rendered configs
+    :return: list of results [[device hostname, rendered config sha256, error],...]
+    """
+    results = []
+    for hostname, parameters in chunk:
+        try:
+            rendered_config = _worker_template.render(parameters)
+            config_hash = hashlib.sha256(rendered_config.encode('utf-8')).hexdigest()
+            if output_dir and not hash_only:
+                with open(config_file_name(output_dir, hostname), 'w') as config_file:
+                    config_file.write(rendered_config)
+            results.append([hostname, config_hash, ''])
+        except Exception as error:
+            results.append([hostname, '', repr(error)])
+    return results
+
+
+def read_render_params(file_name=RENDER_PARAMS_FILE):
+    """
+    Read the devices and template parameters from the file {file_name}, one JSON object per line,
+    ex. {"hostname": "PDX-RN", "params": {"interface_number": "101", "ip_address": "101.100.100.100"}}
+    :param file_name: template parameters file name
+    :return: generator of [device hostname, template parameters]
+    """
+    with open(file_name, 'rb') as params_file:
+        for line in params_file:
+            if line.strip():
+                device = dnac_apis.json_loads(line)
+                yield [device['hostname'], device.get('params') or {}]
+
+
+def bulk_render(device_params, template_name=RENDER_TEMPLATE, output_dir=RENDER_OUTPUT_DIR,
+                cache_dir=RENDER_CACHE_DIR, workers=RENDER_WORKERS, chunk_size=RENDER_CHUNK_SIZE,
+                hash_only=RENDER_HASH_ONLY):
+    """
+    Render the template {template_name} for a large number of devices, using a pool of processes.
+    The devices are sent to the processes in chunks, and only a limited number of chunks are in progress, the devices
+    parameters are read and the results are returned while rendering.
+    :param device_params: iterable of [device hostname, template parameters]
+    :param template_name: template file name
+    :param output_dir: folder to save the rendered configs "{hostname}.cfg", or none
+    :param cache_dir: folder for the compiled templates bytecode
+    :param workers: number of processes, or none for the number of CPUs
+    :param chunk_size: number of devices rendered by a process for each task
+    :param hash_only: return the rendered configs sha256, without saving the configs
+    :return: generator of results [device hostname, rendered config sha256, error], in the input order
+    """
+    # compile the template before starting the processes, they will load the bytecode from the cache
+    get_jinja_env(cache_dir).get_template(template_name)
+    if output_dir and not hash_only:
+        os.makedirs(output_dir, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    device_params = iter(device_params)
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(template_name, cache_dir)) as executor:
+        while True:
+            # keep two chunks per process in progress, to bound the memory used by the parameters and results
+            while len(pending) < 2 * workers:
+                chunk = list(itertools.islice(device_params, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_render_chunk, chunk, output_dir, hash_only))
+            if not pending:
+                break
+            for result in pending.popleft().result():
+                yield result
+
+
+def main():
+    """
+    This script will render the Jinja2 template {RENDER_TEMPLATE} locally, for all the devices and parameters included
+    in the file {RENDER_PARAMS_FILE}, and save the rendered configs to the folder {RENDER_OUTPUT_DIR}.
+    A report with the sha256 of each rendered config, or the rendering error, is saved to file.
+    """
+
+    # the local date and time when the code will start execution
+
+    date_time = str(datetime.datetime.now().replace(microsecond=0))
+
+    print('\n\nApplication "bulk_render.py" Run Started: ' + date_time)
+
+    file_name = 'render_report-' + date_time + '.csv'
+    file_name = file_name.replace(' ', '-')
+    rendered_count = 0
+    error_count = 0
+    with open(file_name, 'w', newline='') as output_file:
+        output_writer = csv.writer(output_file)
+        for result in bulk_render(read_render_params()):
+            output_writer.writerow(result)
+            if result[2]:
+                error_count += 1
+                print('Unable to render the template for the device: ', result[0], ', ', result[2])
+            else:
+                rendered_count += 1
+
+    print('\nThe number of rendered configs is: ', rendered_count, ', the number of errors is: ', error_count)
+    print('\n\nFile ' + file_name + ' saved')
+
+    date_time = str(datetime.datetime.now().replace(microsecond=0))
+    print('\n\nEnd of Application "bulk_render.py" Run: ' + date_time)
+    return
+
+
+if __name__ == "__main__":
+    main()
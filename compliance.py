@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Cisco DNA Center Templates Compliance Check
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2020 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+import jinja2
+
+import dnac_apis
+from config import CONFIG_ARCHIVE_DIR, COMPLIANCE_WORKERS
+
+
+JINJA_ENV = jinja2.Environment(undefined=jinja2.StrictUndefined, keep_trailing_newline=True)
+
+
+def render_template(template_content, parameters):
+    """
+    Render the Jinja2 template content locally, with the template parameters
+    :param template_content: template text content
+    :param parameters: template parameters, or none
+    :return: the rendered configuration
+    """
+    template = JINJA_ENV.from_string(template_content)
+    return template.render(parameters or {})
+
+
+def normalize_line(line):
+    """
+    Normalize a configuration line for comparison: single spaces and no indentation. The case is not changed, the
+    values that differ only in case, ex. passwords, communities or descriptions, are configuration changes.
+    :param line: configuration line
+    :return: normalized line, or '' for empty lines and comments
+    """
+    line = ' '.join(line.split())
+    if line.startswith('!'):
+        return ''
+    return line
+
+
+def parse_running_config(running_config):
+    """
+    Parse the running configuration into the top level commands and their sub-commands.
+    Nested sub-commands are included with the top level command they belong to.
+    :param running_config: device running configuration
+    :return: dictionary {top level command: set of sub-commands}
+    """
+    sections = {}
+    parent = None
+    for line in running_config.splitlines():
+        command = normalize_line(line)
+        if not command:
+            continue
+        if line[0] in ' \t' and parent is not None:
+            sections[parent].add(command)
+        else:
+            parent = command
+            sections.setdefault(parent, set())
+    return sections
+
+
+def missing_config_lines(rendered_config, running_config):
+    """
+    Find the rendered configuration lines not included in the running configuration.
+    Templates often include the sub-commands without indentation, the configuration mode is tracked like the device
+    CLI does: a command found at the top level of the running configuration enters its section, and the next commands
+    not found at the top level are looked up in this section.
+    :param rendered_config: rendered template configuration
+    :param running_config: device running configuration
+    :return: list of missing configuration lines
+    """
+    sections = parse_running_config(running_config)
+    missing_lines = []
+    parent = None
+    for line in rendered_config.splitlines():
+        command = normalize_line(line)
+        if not command:
+            continue
+        if command in ('exit', 'end'):
+            parent = None
+            continue
+        if command in sections:
+            parent = command if sections[command] else None
+        elif parent is None or command not in sections[parent]:
+            missing_lines.append(line.strip())
+    return missing_lines
+
+
+def get_running_config(device_id, hostname, dnac_jwt_token, archive_dir=CONFIG_ARCHIVE_DIR):
+    """
+    Get the device running configuration from the archive file "{hostname}.cfg", if found in the folder {archive_dir},
+    or from Cisco DNA Center
+    :param device_id: Cisco DNA Center device id
+    :param hostname: device hostname
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param archive_dir: folder with the archived running configurations, or none
+    :return: device running configuration
+    """
+    if archive_dir:
+        file_name = os.path.join(archive_dir, hostname + '.cfg')
+        if os.path.exists(file_name):
+            with open(file_name, 'r') as config_file:
+                return config_file.read()
+    return dnac_apis.get_device_config(device_id, dnac_jwt_token)
+
+
+def check_device_compliance(template_content, device_id, hostname, parameters, dnac_jwt_token,
+                            archive_dir=CONFIG_ARCHIVE_DIR):
+    """
+    Check if the device running configuration already includes the rendered template.
+    If the template can't be rendered locally, or the running config can't be retrieved, the device is not compliant.
+    :param template_content: template text content
+    :param device_id: Cisco DNA Center device id
+    :param hostname: device hostname
+    :param parameters: template parameters, or none
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param archive_dir: folder with the archived running configurations, or none
+    :return: True if compliant, False if the template needs to be deployed
+    """
+    try:
+        rendered_config = render_template(template_content, parameters)
+        running_config = get_running_config(device_id, hostname, dnac_jwt_token, archive_dir)
+        return not missing_config_lines(rendered_config, running_config)
+    except Exception as error:
+        print('Unable to check the compliance for the device: ', hostname, ', ', repr(error))
+        return False
+
+
+def filter_drifted_devices(template_content, device_list, parameters, dnac_jwt_token, archive_dir=CONFIG_ARCHIVE_DIR):
+    """
+    Split the devices in compliant devices and drifted devices, checking the running configurations in parallel
+    :param template_content: template text content
+    :param device_list: list of devices [[device hostname, device id],...]
+    :param parameters: template parameters, or none
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param archive_dir: folder with the archived running configurations, or none
+    :return: list of drifted devices hostnames, list of compliant devices hostnames
+    """
+    with ThreadPoolExecutor(max_workers=COMPLIANCE_WORKERS) as executor:
+        results = list(executor.map(
+            lambda device: check_device_compliance(template_content, device[1], device[0], parameters,
+                                                   dnac_jwt_token, archive_dir),
+            device_list))
+    drifted_list = [device[0] for device, compliant in zip(device_list, results) if not compliant]
+    compliant_list = [device[0] for device, compliant in zip(device_list, results) if compliant]
+    return drifted_list, compliant_list
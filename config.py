@@ -42,3 +42,44 @@ NTP_SERVER_J2 = 'ntp_server.j2'
 DEVICE_NAME = 'PDX-RN'
 DEVICE_TYPES = ['Cisco Catalyst38xx stack-able ethernet switch', 'Cisco Catalyst 9300 Switch']
 PARAMS = {'interface_number': '101', 'ip_address': '101.100.100.100'}
+
+DEPLOY_PROJECT = 'project_name'
+DEPLOY_TEMPLATE = 'template_name'
+
+CATALOG_FILE = 'template_catalog.json'  # local cache of the projects, templates, versions and params
+CATALOG_WORKERS = 8  # number of parallel API calls used to retrieve the details for the changed templates
+
+DEPLOY_CHECK_COMPLIANCE = True  # deploy only to the devices with the running config not including the template
+CONFIG_ARCHIVE_DIR = None  # folder with the devices running config files "{hostname}.cfg", or None to use the API
+COMPLIANCE_WORKERS = 8  # number of parallel API calls used to retrieve the devices running config
+
+PIPELINE_QUEUE_SIZE = 100  # maximum number of devices waiting between two deployment stages
+DEPLOY_WORKERS = 4  # number of templates deployments started in parallel
+STATUS_WORKERS = 20  # maximum number of templates deployments started and not yet completed
+
+GC_PROJECTS = [PROJECT_J2]  # the projects to clean up, the other projects are not changed
+GC_KEEP_VERSIONS = 5  # the number of latest committed versions to keep for each template, minimum 1
+GC_VERSION_MAX_AGE_DAYS = 30  # delete the older versions only if older than this, None to delete by count only
+GC_TEMPLATE_MAX_AGE_DAYS = None  # delete the templates not updated for this number of days, None to keep them
+GC_DELETE_EMPTY_PROJECTS = True  # delete the projects with no templates left
+GC_PROJECT_MIN_AGE_DAYS = 7  # delete the empty projects only if not updated for this number of days
+GC_WORKERS = 8  # number of parallel delete API calls
+GC_DRY_RUN = True  # only report the projects, templates and versions to delete
+
+RENDER_TEMPLATE = MANAGEMENT_INT_J2  # the Jinja2 template file to render locally
+RENDER_PARAMS_FILE = 'render_params.jsonl'  # one JSON object per line {"hostname": ..., "params": {...}}
+RENDER_OUTPUT_DIR = 'rendered_configs'  # folder for the rendered configs "{hostname}.cfg"
+RENDER_CACHE_DIR = '.jinja2_cache'  # folder for the compiled templates bytecode, shared across runs
+RENDER_WORKERS = None  # number of render processes, None for the number of CPUs
+RENDER_CHUNK_SIZE = 500  # number of devices rendered by a process for each task
+RENDER_HASH_ONLY = False  # save only the hash of the rendered configs, not the configs
+
+USE_EVENT_COMPLETION = False  # wait for the deployments completion using the events notifications, not polling
+EVENT_RECEIVER_HOST = '0.0.0.0'  # the local address and port for the events notifications HTTP receiver
+EVENT_RECEIVER_PORT = 9000
+EVENT_RECEIVER_URL = 'http://your_host:9000/events'  # the receiver URL, as reachable from Cisco DNA Center
+EVENT_IDS = []  # the ids of the events reporting the templates deployments and tasks completion, required
+EVENT_SUBSCRIPTION_NAME = 'dnacenter_jinja2_templates'  # the webhook destination and subscription, reused by all runs
+EVENT_RECEIVER_SECRET = None  # shared secret required in the events "x-event-secret" header, None to disable
+EVENT_POLL_INTERVAL = 30  # seconds, slow polling for the deployments and tasks not reported by events
+EVENT_WAIT_TIMEOUT = 600  # seconds, maximum wait for the deployments and tasks completion
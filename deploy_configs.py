@@ -31,18 +31,27 @@ import datetime
 import time
 import json
 import csv
+import sys
+import threading
 
 import urllib3
 from requests.auth import HTTPBasicAuth  # for Basic Auth
 from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
 
 import dnac_apis
+import template_catalog
+import compliance
+import event_receiver
+import pipeline
 from config import DNAC_PASS, DNAC_USER
-from config import DEPLOY_PROJECT, DEPLOY_TEMPLATE, DEVICE_TYPES
+from config import DEPLOY_PROJECT, DEPLOY_TEMPLATE, DEVICE_TYPES, DEPLOY_CHECK_COMPLIANCE, USE_EVENT_COMPLETION
+from config import COMPLIANCE_WORKERS, PIPELINE_QUEUE_SIZE, DEPLOY_WORKERS, STATUS_WORKERS
 urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
 
 DNAC_AUTH = HTTPBasicAuth(DNAC_USER, DNAC_PASS)
 
+TOKEN_REFRESH_INTERVAL = 45 * 60  # seconds, the Cisco DNA Center token expires after 60 min
+
 
 def pprint(json_data):
     """
@@ -59,7 +68,11 @@ def main():
     The device family is defined by a list "DEVICE_TYPES"
     It will collect all the devices that match the device types, identify those that are reachable, and those that are
     not reachable.
-    The script will deploy the configuration template to each reachable device.
+    The script will deploy the configuration template to each reachable device, skipping the devices with the running
+    configuration already including the rendered template.
+    The inventory, filter, compliance check, deploy, deployment status and report stages run at the same time,
+    connected by bounded queues: the deployments start as soon as the first matching devices are found, and the
+    report is saved as the deployments are completed.
     There are some optional commands included that will allow to test the template deployment to a small number of
     devices first.
     """
@@ -73,94 +86,177 @@ def main():
     # get a Cisco DNA Center auth token
     dnac_auth = dnac_apis.get_dnac_jwt_token(DNAC_AUTH)
 
-    # verify if existing template in the project
-    template_id = dnac_apis.get_template_id(DEPLOY_TEMPLATE, DEPLOY_PROJECT, dnac_auth)
+    # get a new Cisco DNA Center auth token when needed, required for mass device configs, script running will take
+    # longer than 60 min.
+    token = {'value': dnac_auth, 'time': time.time()}
+    token_lock = threading.Lock()
+
+    def get_auth():
+        with token_lock:
+            if time.time() - token['time'] > TOKEN_REFRESH_INTERVAL:
+                token['value'] = dnac_apis.get_dnac_jwt_token(DNAC_AUTH)
+                token['time'] = time.time()
+            return token['value']
+
+    # refresh the local templates catalog, and find the template in the project, the template content is required
+    # for the compliance pre-check
+    catalog, catalog_refreshed = template_catalog.refresh_catalog(dnac_auth)
+    template = template_catalog.get_template_by_name(catalog, DEPLOY_TEMPLATE, DEPLOY_PROJECT)
+    if template is None:
+        print('\nUnable to find the template "' + DEPLOY_TEMPLATE + '" in the project "' + DEPLOY_PROJECT + '"')
+        return
+    template_id = template['id']
+    template_content = template['templateContent']
+
+    # the template may have changed since the previous catalog refresh, the devices compliant with the previous
+    # template content would be skipped, deploy to all the selected devices
+    check_compliance = DEPLOY_CHECK_COMPLIANCE
+    if not catalog_refreshed:
+        print('\nWarning: using the templates catalog from: ', catalog['refreshTime'])
+        if check_compliance:
+            print('The template content may not be current, the compliance pre-check is disabled')
+            check_compliance = False
 
     print('\nThe template "' + DEPLOY_TEMPLATE + '" id is: ', template_id)
 
-    # find all devices managed by Cisco DNA C, that are "switches and hubs"
-    device_list = dnac_apis.get_all_device_list(500, dnac_auth)
-
-    # create the switches list
-    switch_list_reachable = []
-    switch_list_unreachable = []
-
-    # identify all devices that match the device type
-    for device in device_list:
-        device_type = device['type']
-        if device_type in DEVICE_TYPES:
-            hostname = device['hostname']
-            if device['reachabilityStatus'] == 'Reachable':
-                switch_list_reachable.append(hostname)
-            else:
-                switch_list_unreachable.append(hostname)
-
-    print('\nThe unreachable devices to which the template will not be deployed are:', switch_list_unreachable, '\n')
-    print('\nThe devices to which the template will be deployed are:', switch_list_reachable)
-    total_number_devices = len(switch_list_reachable)
-    print('\nThe number of devices to deploy the template to is: ', total_number_devices)
-
-    # we will configure a number of devices equal with "device_count" starting with the device from the list
-    # identified with "first_record"
+    # we will configure a number of devices equal with "device_count" starting with the device identified with
+    # "first_record", from the list of reachable devices that match the device types. The devices are selected while
+    # the inventory is collected, the list and the total number of reachable devices are not known before selecting
 
-    first_record = int(input('\nWhat is the device index you want to start with ? (integer between 0 and ' + str(
-        total_number_devices) + ')  '))
+    first_record = int(input('\nWhat is the device index you want to start with ? (integer, 0 for the first device)  '))
     device_count = int(input('How many devices do you want to configure ?  '))
-    if device_count + first_record >= total_number_devices:
-        device_count = total_number_devices - first_record
-        print('Changed the number of the devices to maximum allowed: ', device_count)
 
-    device_index = first_record
+    # optional, start the events notifications receiver, to be notified when the deployments are completed
+    receiver = None
+    if USE_EVENT_COMPLETION:
+        receiver = event_receiver.CompletionReceiver()
+        receiver.start()
+        if not receiver.subscribe(dnac_auth):
+            print('\nThe deployments completion will be checked by polling')
+            receiver.stop()
+            receiver = None
+
+    device_queue = pipeline.bounded_queue(PIPELINE_QUEUE_SIZE)
+    check_queue = pipeline.bounded_queue(PIPELINE_QUEUE_SIZE)
+    deploy_queue = pipeline.bounded_queue(PIPELINE_QUEUE_SIZE)
+    status_queue = pipeline.bounded_queue(PIPELINE_QUEUE_SIZE)
+    report_queue = pipeline.bounded_queue(PIPELINE_QUEUE_SIZE)
+    inventory_done = threading.Event()
+    selection = {'reachable': 0, 'selected': 0}
+    pipeline_errors = []  # the pipeline errors, ex. an inventory page not retrieved, the device list is incomplete
+
+    # the maximum number of deployments started and not yet completed, same for any queue sizes
+    deployments_in_progress = threading.BoundedSemaphore(STATUS_WORKERS)
+
+    # find all devices managed by Cisco DNA C, page by page
+    pipeline.start_source(lambda: dnac_apis.iter_all_device_list(500, get_auth()), device_queue,
+                          stop_event=inventory_done, errors=pipeline_errors)
+
+    def filter_device(device, put):
+        # identify the reachable devices that match the device type, and select the devices to deploy to
+        if selection['selected'] >= device_count or device['type'] not in DEVICE_TYPES:
+            return
+        hostname = device['hostname']
+        if device['reachabilityStatus'] != 'Reachable':
+            print('\nThe unreachable device to which the template will not be deployed is: ', hostname)
+            return
+        selection['reachable'] += 1
+        if selection['reachable'] > first_record:
+            put([hostname, device['id'], first_record + selection['selected']])
+            selection['selected'] += 1
+            if selection['selected'] >= device_count:
+                inventory_done.set()  # all devices selected, stop collecting the inventory
+
+    def check_device(switch, put):
+        # compliance pre-check, deploy the template only to the devices with the running config not including it
+        if check_compliance and compliance.check_device_compliance(template_content, switch[1], switch[0], None,
+                                                                   get_auth()):
+            report_queue.put([switch[0], '', 'COMPLIANT', switch[2]])
+        else:
+            put(switch)
+
+    def deploy_device(switch, put):
+        deployments_in_progress.acquire()  # released when the deployment is completed
+        try:
+            deployment_id = dnac_apis.send_deploy_template_id(template_id, switch[0], None, get_auth())
+        except Exception as error:
+            deployments_in_progress.release()
+            print('\nUnable to deploy the template to the switch: ', switch[0], ', ', repr(error))
+            report_queue.put([switch[0], '', 'FAILURE', switch[2]])
+            return
+        if receiver is not None:
+            receiver.expect([deployment_id])
+        print('\nTemplate "' + DEPLOY_TEMPLATE + '" started for switch: ', switch[0], ', task id: "' + deployment_id +
+              '"')
+        put([switch[0], deployment_id, switch[2], time.time()])
+
+    def check_deployment(deployment, put):
+        switch, deployment_id, device_index, start_time = deployment
+        try:
+            time.sleep(max(0, start_time + 5 - time.time()))  # wait for the deployment task to be created
+            if receiver is not None:
+                deployment_status = receiver.wait_for_deployment(deployment_id, get_auth())
+            else:
+                deployment_status = dnac_apis.check_template_deployment_status(deployment_id, get_auth())
+        finally:
+            deployments_in_progress.release()
+        put([switch, deployment_id, deployment_status, device_index])
+
+    pipeline.start_stage(filter_device, device_queue, check_queue, out_workers=COMPLIANCE_WORKERS,
+                         errors=pipeline_errors)
+    pipeline.start_stage(check_device, check_queue, deploy_queue, workers=COMPLIANCE_WORKERS,
+                         out_workers=DEPLOY_WORKERS, errors=pipeline_errors)
+    pipeline.start_stage(deploy_device, deploy_queue, status_queue, workers=DEPLOY_WORKERS,
+                         out_workers=STATUS_WORKERS, errors=pipeline_errors)
+    pipeline.start_stage(check_deployment, status_queue, report_queue, workers=STATUS_WORKERS,
+                         errors=pipeline_errors)
+
+    # save the deployment report to file, as the results are received
+    file_name = 'deployment_report-' + str(date_time) + '.csv'
+    file_name = file_name.replace(' ', '-')
+    output_file = open(file_name, 'w', newline='')
+    output_writer = csv.writer(output_file)
 
-    # create a list with the structure [[device hostname, deployment status},...]
+    # create a list with the structure [[device hostname, deployment id, deployment status],...]
     deployment_report = []
+    for item in pipeline.iter_queue(report_queue):
+        print('Deployment task result for switch: ', item[0], ' is: ', item[2], ', device index: ', item[3])
+        device_info = [item[0], item[1], item[2]]
+        deployment_report.append(device_info)
+        output_writer.writerow(device_info)
+        output_file.flush()
 
-    for switch in switch_list_reachable[first_record:first_record+device_count]:
-        # deploy the template
-
-        # get a Cisco DNA Center auth token, required for mass device configs, script running will take longer than
-        # 60 min.
-        dnac_auth = dnac_apis.get_dnac_jwt_token(DNAC_AUTH)
-
-        deployment_id = dnac_apis.send_deploy_template_no_params(DEPLOY_TEMPLATE, DEPLOY_PROJECT, switch, dnac_auth)
-    
-        print('\nTemplate "' + DEPLOY_TEMPLATE + '" started, task id: "' + deployment_id + '"')
-        time.sleep(5)  # wait for the deployment task to be created
-    
-        deployment_status = dnac_apis.check_template_deployment_status(deployment_id, dnac_auth)
-        print('Deployment task result for switch: ', switch, ' is: ', deployment_status, ', device index: ',
-              device_index)
-        device_index += 1
-
-        deployment_report.append([switch, deployment_id, deployment_status])
+    # the errors are included in the report, the devices not deployed may be missing from the report
+    for error in pipeline_errors:
+        output_writer.writerow(['PIPELINE ERROR', error[0], str(error[1]) + ' ' + error[2]])
+    output_file.close()
 
-        # optional for manual deployment to test
-        # value = input('Input y/n to continue ')
-        # if value == 'n':
-        #    break
+    if receiver is not None:
+        receiver.stop()
 
     print('\nThe deployment report:\n')
     for item in deployment_report:
         print(item)
 
-    date_time = str(datetime.datetime.now().replace(microsecond=0))
-    # save information to file
-    file_name = 'deployment_report-' + str(date_time) + '.csv'
-    file_name = file_name.replace(' ', '-')
-    output_file = open(file_name, 'w', newline='')
-    output_writer = csv.writer(output_file)
-
-    # loop through all devices and deployment status to collect the information needed in the report
-    for device in deployment_report:
-        device_info = [device[0], device[1], device[2]]
-        output_writer.writerow(device_info)
-    output_file.close()
+    # the inventory is not collected after all the devices are selected, the number of reachable devices is counted
+    # only for the devices scanned
+    print('\nThe number of reachable devices that match the device types, in the devices scanned, is: ',
+          selection['reachable'], ', the number of devices selected is: ', selection['selected'])
+    if selection['selected'] < device_count:
+        print('Only ', selection['selected'], ' reachable devices found starting with the device index: ', first_record,
+              ', the number of devices requested is: ', device_count)
     print('\n\nFile ' + file_name + ' saved')
 
     date_time = str(datetime.datetime.now().replace(microsecond=0))
     print('\n\nEnd of Application "deploy_configs.py" Run: ' + date_time)
+    if pipeline_errors:
+        print('\nThe run was not completed, the number of errors is: ', len(pipeline_errors),
+              ', the report may not include all the selected devices')
+        for error in pipeline_errors:
+            print(error)
+        return 1
     return
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -31,6 +31,7 @@ __license__ = "Cisco Sample Code License, Version 1.1"
 import requests
 import json
 import time
+import codecs
 import urllib3
 
 from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
@@ -38,11 +39,22 @@ from requests.auth import HTTPBasicAuth  # for Basic Auth
 
 from config import DNAC_URL, DNAC_PASS, DNAC_USER
 
+try:
+    import orjson  # optional, faster JSON decoding for large responses
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional, incremental JSON parsing for large responses
+except ImportError:
+    ijson = None
 
 urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
 
 DNAC_AUTH = HTTPBasicAuth(DNAC_USER, DNAC_PASS)
 
+STREAM_CHUNK_SIZE = 65536  # bytes read from the network for each chunk of a streamed response
+
 
 def pprint(json_data):
     """
@@ -53,6 +65,172 @@ def pprint(json_data):
     print(json.dumps(json_data, indent=4, separators=(' , ', ' : ')))
 
 
+def json_loads(data):
+    """
+    Decode JSON formatted data, using orjson if installed, and the standard library json module if not
+    :param data: JSON formatted bytes or string
+    :return: the decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def response_json(response):
+    """
+    Decode the JSON body of an API call response, using the fast decoder if available
+    :param response: API call response
+    :return: the decoded response body
+    """
+    return json_loads(response.content)
+
+
+class _JsonStream(object):
+    """
+    Minimal pull parser over the chunks of a streamed response, used when ijson is not installed.
+    Only the text not yet consumed is kept in memory.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self):
+        """
+        Append the next chunk to the buffer, dropping the text already consumed
+        :return: False if the stream is exhausted
+        """
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            text = self.text_decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self.text_decoder.decode(b'', final=True)
+        self.eof = True
+        return True
+
+    def next_char(self):
+        """
+        Skip whitespace and return the next character, without consuming it
+        :return: the next character, or '' at the end of the stream
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\n\r':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ''
+
+    def expect(self, char):
+        """
+        Consume the next character, which must be {char}
+        :param char: expected character
+        :return: none
+        """
+        if self.next_char() != char:
+            raise ValueError('Expecting "' + char + '" in the JSON response')
+        self.pos += 1
+
+    def value(self):
+        """
+        Decode and consume the next complete JSON value, reading more chunks as needed
+        :return: the decoded value
+        """
+        self.next_char()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+                # a value ending at the buffer end may be truncated, unless the stream is exhausted. A number may be
+                # truncated before the end of the buffer too, ex. "1" decoded from "1.", it is complete only if
+                # followed by a delimiter
+                if self.eof or (end < len(self.buffer) and
+                                (not isinstance(value, (int, float)) or self.buffer[end] in ' \t\n\r,]}')):
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self.read_more()
+
+
+def _iter_json_array_stdlib(chunks, key):
+    """
+    Yield the items of a JSON array from the chunks of a streamed response, using the standard library json module
+    :param chunks: iterable of response body chunks, bytes
+    :param key: name of the top level key with the array value, or none if the body is the array
+    :return: generator of array items
+    """
+    stream = _JsonStream(chunks)
+    if key is not None:
+        stream.expect('{')
+        while True:
+            if stream.next_char() == '}':
+                raise ValueError('Key "' + key + '" not found in the JSON response')
+            name = stream.value()
+            stream.expect(':')
+            if name == key:
+                break
+            stream.value()  # skip the value of any other key
+            if stream.next_char() == ',':
+                stream.expect(',')
+    if stream.next_char() != '[':
+        raise ValueError('Expecting an array in the JSON response')
+    stream.expect('[')
+    if stream.next_char() == ']':
+        return
+    while True:
+        yield stream.value()
+        if stream.next_char() == ']':
+            return
+        stream.expect(',')
+
+
+def _check_array_events(events, prefix):
+    """
+    Pass through the ijson parser events, verifying the value with the prefix {prefix} is found and is an array
+    :param events: ijson parser events
+    :param prefix: ijson prefix of the array, '' for the top level value
+    :return: generator of the same events
+    """
+    found = False
+    for event in events:
+        if event[0] == prefix and not found:
+            if event[1] != 'start_array':
+                raise ValueError('Expecting an array in the JSON response')
+            found = True
+        yield event
+    if not found:
+        raise ValueError('Key "' + prefix + '" not found in the JSON response')
+
+
+def iter_json_array(response, key=None):
+    """
+    Incrementally parse the JSON array included in an API call response, and yield the array items one at a time,
+    without loading the entire response body in memory. ijson is used if installed, with a standard library fallback.
+    :param response: API call response, requested with {stream=True}
+    :param key: name of the top level key with the array value, ex. 'response', or none if the body is the array
+    :return: generator of array items, raises an exception for an error response, or if the array is not found
+    """
+    response.raise_for_status()
+    if ijson is not None:
+        response.raw.decode_content = True  # let urllib3 handle any gzip/deflate content encoding
+        events = _check_array_events(ijson.parse(response.raw, use_float=True), key or '')
+        for item in ijson.items(events, key + '.item' if key is not None else 'item'):
+            yield item
+    else:
+        for item in _iter_json_array_stdlib(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), key):
+            yield item
+
+
 def get_dnac_jwt_token(dnac_auth):
     """
     Create the authorization token required to access Cisco DNA Center
@@ -76,7 +254,7 @@ def get_all_device_info(dnac_jwt_token):
     url = DNAC_URL + '/dna/intent/api/v1/network-device'
     header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
     all_device_response = requests.get(url, headers=header, verify=False)
-    all_device_info = all_device_response.json()
+    all_device_info = response_json(all_device_response)
     return all_device_info['response']
 
 
@@ -94,6 +272,20 @@ def get_device_info(device_id, dnac_jwt_token):
     return device_info['response'][0]
 
 
+def get_device_config(device_id, dnac_jwt_token):
+    """
+    This function will retrieve the running configuration for the device with the Cisco DNA Center {device id}
+    :param device_id: Cisco DNA Center device_id
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: device running configuration
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/network-device/' + device_id + '/config'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.get(url, headers=header, verify=False)
+    config_json = response_json(response)
+    return config_json['response']
+
+
 def get_project_id(project_name, dnac_jwt_token):
     """
     This function will retrieve the CLI templates {project id} for the project with the name {project_name}
@@ -154,12 +346,38 @@ def delete_project(project_name, dnac_jwt_token):
     :return: response status code
     """
     project_id = get_project_id(project_name, dnac_jwt_token)
+    return delete_project_id(project_id, dnac_jwt_token)
+
+
+def delete_project_id(project_id, dnac_jwt_token):
+    """
+    This function will delete the CLI templates project with the id {project_id}
+    :param project_id: CLI project id
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: response status code
+    """
     url = DNAC_URL + '/dna/intent/api/v1/template-programmer/project/' + project_id
     header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
     response = requests.delete(url, headers=header, verify=False)
     return response.status_code
 
 
+def get_all_project_info(dnac_jwt_token):
+    """
+    This function will return the info for all CLI templates projects, including the projects with no templates
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: list of all projects, including names, ids and templates
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/template-programmer/project'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.get(url, headers=header, verify=False)
+    response.raise_for_status()
+    project_list = response_json(response)
+    if not isinstance(project_list, list):
+        raise ValueError('Expecting the list of projects in the JSON response')
+    return project_list
+
+
 def get_project_info(project_name, dnac_jwt_token):
     """
     This function will retrieve all templates associated with the project with the name {project_name}
@@ -170,7 +388,7 @@ def get_project_info(project_name, dnac_jwt_token):
     url = DNAC_URL + '/dna/intent/api/v1/template-programmer/project?name=' + project_name
     header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
     response = requests.get(url, headers=header, verify=False)
-    project_json = response.json()
+    project_json = response_json(response)
     template_list = project_json[0]['templates']
     return template_list
 
@@ -305,9 +523,20 @@ def delete_template(template_name, project_name, dnac_jwt_token):
     :return: none
     """
     template_id = get_template_id(template_name, project_name, dnac_jwt_token)
+    delete_template_id(template_id, dnac_jwt_token)
+
+
+def delete_template_id(template_id, dnac_jwt_token):
+    """
+    This function will delete the template, or the committed template version, with the id {template_id}
+    :param template_id: template id, or template version id
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: response status code
+    """
     url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template/' + template_id
     header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
     response = requests.delete(url, headers=header, verify=False)
+    return response.status_code
 
 
 def get_all_template_info(dnac_jwt_token):
@@ -319,10 +548,40 @@ def get_all_template_info(dnac_jwt_token):
     url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template'
     header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
     response = requests.get(url, headers=header, verify=False)
-    all_template_list = response.json()
+    all_template_list = response_json(response)
     return all_template_list
 
 
+def iter_all_template_info(dnac_jwt_token):
+    """
+    This function will yield the info for each CLI template existing on Cisco DNA Center, including all their versions,
+    parsing the response incrementally, without loading the entire templates list in memory
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: generator of templates info
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    with requests.get(url, headers=header, verify=False, stream=True) as response:
+        for template in iter_json_array(response):
+            yield template
+
+
+def get_template_details(template_id, dnac_jwt_token):
+    """
+    This function will return the details for the template with the id {template_id}, including the template content
+    and parameters
+    :param template_id: template id
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: template details
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template/' + template_id
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.get(url, headers=header, verify=False)
+    response.raise_for_status()
+    template_details = response_json(response)
+    return template_details
+
+
 def get_template_id(template_name, project_name, dnac_jwt_token):
     """
     This function will return the template id for the Cisco DNA Center template with the name {template_name},
@@ -352,22 +611,7 @@ def send_deploy_template(template_name, project_name, device_name, parameters, d
     :return: the deployment task id
     """
     template_id = get_template_id(template_name, project_name, dnac_jwt_token)
-    payload = {
-            "templateId": template_id,
-            "forcePushTemplate": True,
-            "targetInfo": [
-                {
-                    "id": device_name,
-                    "type": "MANAGED_DEVICE_HOSTNAME",
-                    "params": parameters
-                }
-            ]
-        }
-    url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template/deploy'
-    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
-    deployment = requests.post(url, headers=header, data=json.dumps(payload), verify=False)
-    deployment_json = deployment.json()
-    depl_task_id = deployment_json["deploymentId"].split(' ')[-1]
+    depl_task_id = send_deploy_template_id(template_id, device_name, parameters, dnac_jwt_token)
     return depl_task_id
 
 
@@ -382,15 +626,32 @@ def send_deploy_template_no_params(template_name, project_name, device_name, dna
     :return: the deployment task id
     """
     template_id = get_template_id(template_name, project_name, dnac_jwt_token)
+    depl_task_id = send_deploy_template_id(template_id, device_name, None, dnac_jwt_token)
+    return depl_task_id
+
+
+def send_deploy_template_id(template_id, device_name, parameters, dnac_jwt_token, force_push=True):
+    """
+    This function will deploy the template with the id {template_id} to the network device with the name
+    {device_name}. Use it when the template id is already known, ex. from the local templates catalog, to avoid
+    retrieving the project templates for each deployment.
+    :param template_id: template id
+    :param device_name: device hostname
+    :param parameters: template parameters, or none
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param force_push: push the template even if Cisco DNA Center reports it as already deployed to the device
+    :return: the deployment task id
+    """
+    target_info = {
+            "id": device_name,
+            "type": "MANAGED_DEVICE_HOSTNAME"
+        }
+    if parameters is not None:
+        target_info["params"] = parameters
     payload = {
             "templateId": template_id,
-            "forcePushTemplate": True,
-            "targetInfo": [
-                {
-                    "id": device_name,
-                    "type": "MANAGED_DEVICE_HOSTNAME"
-                }
-            ]
+            "forcePushTemplate": force_push,
+            "targetInfo": [target_info]
         }
     url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template/deploy'
     header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
@@ -414,20 +675,32 @@ def check_template_deployment_status(depl_task_id, dnac_jwt_token):
     while deployment_status == 'unknown':
         time.sleep(5)
         count += 1
-        try:
-            url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template/deploy/status/' + depl_task_id
-            header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
-            deployment_response = requests.get(url, headers=header, verify=False)
-            deployment_response_json = deployment_response.json()
-            if deployment_response_json['endTime'] != '':
-                deployment_status = deployment_response_json['status']
-                return deployment_status
-        except:
-            pass
+        deployment_status = get_template_deployment_status(depl_task_id, dnac_jwt_token)
+        if deployment_status != 'unknown':
+            return deployment_status
         if count >= 24:
             return deployment_status
 
 
+def get_template_deployment_status(depl_task_id, dnac_jwt_token):
+    """
+    This function will check once the result for the deployment of the CLI template with the id {depl_task_id}
+    :param depl_task_id: template deployment id
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: status - {SUCCESS} or {FAILURE}, or {unknown} if the deployment is not completed
+    """
+    try:
+        url = DNAC_URL + '/dna/intent/api/v1/template-programmer/template/deploy/status/' + depl_task_id
+        header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+        deployment_response = requests.get(url, headers=header, verify=False)
+        deployment_response_json = deployment_response.json()
+        if deployment_response_json['endTime'] != '':
+            return deployment_response_json['status']
+    except:
+        pass
+    return 'unknown'
+
+
 def check_task_id_status(task_id, dnac_jwt_token):
     """
     This function will check the status of the task with the id {task_id}
@@ -440,15 +713,173 @@ def check_task_id_status(task_id, dnac_jwt_token):
 
     while task_result == '':
         time.sleep(1)
-        url = DNAC_URL + '/dna/intent/api/v1/task/' + task_id
-        header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
-        task_response = requests.get(url, headers=header, verify=False)
-        task_json = task_response.json()
-        task_status = task_json['response']
-        if 'endTime' in task_status.keys():
+        task_status = get_task_id_status(task_id, dnac_jwt_token)
+        if task_status is not None:
             return task_status
 
 
+def get_task_id_status(task_id, dnac_jwt_token):
+    """
+    This function will check once the status of the task with the id {task_id}
+    :param task_id: task id
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: the task status, or none if the task is not completed
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/task/' + task_id
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    task_response = requests.get(url, headers=header, verify=False)
+    task_json = task_response.json()
+    task_status = task_json['response']
+    if 'endTime' in task_status.keys():
+        return task_status
+    return None
+
+
+def get_webhook_destinations(dnac_jwt_token):
+    """
+    This function will return all the webhook destinations, used by the REST events subscriptions
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: list of webhook destinations, including names, ids, URLs and headers
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/event/webhook'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.get(url, headers=header, verify=False)
+    response.raise_for_status()
+    webhook_list = response_json(response).get('statusMessage') or []
+    return webhook_list
+
+
+def webhook_destination_payload(webhook_name, receiver_url, headers=None):
+    """
+    Create the webhook destination payload, for the create and update API calls
+    :param webhook_name: webhook destination name
+    :param receiver_url: the URL of the HTTP receiver for the events notifications
+    :param headers: dictionary of the HTTP headers included in the notifications, or none
+    :return: webhook destination payload
+    """
+    return {
+        "name": webhook_name,
+        "description": webhook_name,
+        "url": receiver_url,
+        "method": "POST",
+        "trustCert": False,
+        "headers": [{"name": name, "value": value, "defaultValue": value, "encrypt": False}
+                    for name, value in (headers or {}).items()],
+        "isProxyRoute": False
+    }
+
+
+def create_webhook_destination(webhook_name, receiver_url, dnac_jwt_token, headers=None):
+    """
+    This function will create the webhook destination with the name {webhook_name}, sending the events notifications
+    with REST calls to the URL {receiver_url}
+    :param webhook_name: webhook destination name
+    :param receiver_url: the URL of the HTTP receiver for the events notifications
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param headers: dictionary of the HTTP headers included in the notifications, or none
+    :return: response status code
+    """
+    payload = webhook_destination_payload(webhook_name, receiver_url, headers)
+    url = DNAC_URL + '/dna/intent/api/v1/event/webhook'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.post(url, data=json.dumps(payload), headers=header, verify=False)
+    return response.status_code
+
+
+def update_webhook_destination(webhook_id, webhook_name, receiver_url, dnac_jwt_token, headers=None):
+    """
+    This function will update the webhook destination with the id {webhook_id}, to send the events notifications
+    with REST calls to the URL {receiver_url}
+    :param webhook_id: webhook destination id
+    :param webhook_name: webhook destination name
+    :param receiver_url: the URL of the HTTP receiver for the events notifications
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param headers: dictionary of the HTTP headers included in the notifications, or none
+    :return: response status code
+    """
+    payload = webhook_destination_payload(webhook_name, receiver_url, headers)
+    payload['webhookId'] = webhook_id
+    url = DNAC_URL + '/dna/intent/api/v1/event/webhook'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.put(url, data=json.dumps(payload), headers=header, verify=False)
+    return response.status_code
+
+
+def get_event_subscriptions(dnac_jwt_token):
+    """
+    This function will return all the REST events subscriptions
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: list of events subscriptions, including names, ids, webhook destinations and events filters
+    """
+    url = DNAC_URL + '/dna/intent/api/v1/event/subscription/rest'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.get(url, headers=header, verify=False)
+    response.raise_for_status()
+    subscription_list = response_json(response)
+    return subscription_list
+
+
+def event_subscription_payload(subscription_name, event_ids, webhook_id):
+    """
+    Create the REST events subscription payload, for the create and update API calls
+    :param subscription_name: subscription name
+    :param event_ids: list of event ids
+    :param webhook_id: the id of the webhook destination for the events notifications
+    :return: events subscription payload
+    """
+    return {
+        "name": subscription_name,
+        "description": subscription_name,
+        "subscriptionEndpoints": [
+            {
+                "instanceId": webhook_id,
+                "subscriptionDetails": {
+                    "connectorType": "REST"
+                }
+            }
+        ],
+        "filter": {
+            "eventIds": event_ids
+        }
+    }
+
+
+def create_event_subscription(subscription_name, event_ids, webhook_id, dnac_jwt_token):
+    """
+    This function will create the REST subscription with the name {subscription_name}, to receive the notifications
+    for the events with the ids {event_ids}, sent to the webhook destination with the id {webhook_id}
+    :param subscription_name: subscription name
+    :param event_ids: list of event ids
+    :param webhook_id: the id of the webhook destination for the events notifications
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: response status code
+    """
+    payload = [event_subscription_payload(subscription_name, event_ids, webhook_id)]
+    url = DNAC_URL + '/dna/intent/api/v1/event/subscription/rest'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.post(url, data=json.dumps(payload), headers=header, verify=False)
+    return response.status_code
+
+
+def update_event_subscription(subscription_id, subscription_name, event_ids, webhook_id, dnac_jwt_token):
+    """
+    This function will update the REST subscription with the id {subscription_id}, to receive the notifications
+    for the events with the ids {event_ids}, sent to the webhook destination with the id {webhook_id}
+    :param subscription_id: subscription id
+    :param subscription_name: subscription name
+    :param event_ids: list of event ids
+    :param webhook_id: the id of the webhook destination for the events notifications
+    :param dnac_jwt_token: Cisco DNA Center token
+    :return: response status code
+    """
+    payload = event_subscription_payload(subscription_name, event_ids, webhook_id)
+    payload['subscriptionId'] = subscription_id
+    url = DNAC_URL + '/dna/intent/api/v1/event/subscription/rest'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
+    response = requests.put(url, data=json.dumps([payload]), headers=header, verify=False)
+    return response.status_code
+
+
 def get_all_device_list(limit, dnac_jwt_token):
     """
     The function will return all network devices info, using the specified limit of devices/API Call
@@ -456,16 +887,26 @@ def get_all_device_list(limit, dnac_jwt_token):
     :param dnac_jwt_token: Cisco DNA C token
     :return: DNA C device inventory info
     """
+    all_devices_list = list(iter_all_device_list(limit, dnac_jwt_token))
+    return all_devices_list
+
+
+def iter_all_device_list(limit, dnac_jwt_token):
+    """
+    The function will yield the info for each network device, using the specified limit of devices/API Call.
+    Each page is parsed incrementally, the devices are available before the entire inventory is collected.
+    :param limit: the number of devices to return per API call
+    :param dnac_jwt_token: Cisco DNA C token
+    :return: generator of DNA C device inventory info
+    """
     offset = 1
-    all_devices_list = []
-    all_devices_info = ['']  # assign a value, to make sure the API call will run at least once
-    while all_devices_info:
-        all_devices_info = ''
+    page_count = limit  # assign a value, to make sure the API call will run at least once
+    while page_count:
+        page_count = 0
         url = DNAC_URL + '/dna/intent/api/v1/network-device?offset=' + str(offset) + '&limit=' + str(limit)
         header = {'content-type': 'application/json', 'x-auth-token': dnac_jwt_token}
-        all_devices_response = requests.get(url, headers=header, verify=False)
-        all_devices_json = all_devices_response.json()
-        all_devices_info = all_devices_json['response']
-        all_devices_list += all_devices_info
+        with requests.get(url, headers=header, verify=False, stream=True) as all_devices_response:
+            for device in iter_json_array(all_devices_response, 'response'):
+                page_count += 1
+                yield device
         offset += limit
-    return all_devices_list
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Cisco DNA Center Events Notifications Receiver
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2020 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import hmac
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import dnac_apis
+from config import EVENT_RECEIVER_HOST, EVENT_RECEIVER_PORT, EVENT_RECEIVER_URL, EVENT_IDS
+from config import EVENT_SUBSCRIPTION_NAME, EVENT_RECEIVER_SECRET
+from config import EVENT_POLL_INTERVAL, EVENT_WAIT_TIMEOUT
+
+
+ID_KEYS = ['deploymentId', 'taskId']  # the event keys with the ids of the completed deployments and tasks
+STATUS_KEYS = ['status', 'deploymentStatus']  # the event keys with the deployments status
+FINAL_STATUSES = ['SUCCESS', 'FAILURE']  # the deployment status values reported when completed
+SECRET_HEADER = 'x-event-secret'  # the events HTTP header with the shared secret
+
+
+def parse_event(event):
+    """
+    Find the ids of the completed deployments or tasks, and their status, in an event notification.
+    The ids and status are looked up in the event, and in the event "details". Only final status values are returned.
+    :param event: event notification
+    :return: list of [deployment or task id, status or none]
+    """
+    completions = []
+    for source in [event, event.get('details')]:
+        if not isinstance(source, dict):
+            continue
+        status = None
+        for key in STATUS_KEYS:
+            if str(source.get(key, '')).upper() in FINAL_STATUSES:
+                status = source[key].upper()
+        for key in ID_KEYS:
+            if source.get(key):
+                # the deployment id may be included as "Template Deployment Id: {id}", same as the deploy API
+                completions.append([str(source[key]).split(' ')[-1], status])
+    return completions
+
+
+class CompletionReceiver(object):
+    """
+    Local HTTP receiver for the Cisco DNA Center events notifications. The waits for the deployments and tasks
+    completion are resolved as the events are received, with slow polling for the ids not reported by events.
+    By default, the events only trigger one status check, the status included in the event is not trusted.
+    """
+
+    def __init__(self, host=EVENT_RECEIVER_HOST, port=EVENT_RECEIVER_PORT, secret=EVENT_RECEIVER_SECRET):
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.pending = set()  # the deployment and task ids expected, the events for other ids are ignored
+        self.completed = {}  # {deployment or task id: status or none}, for the events not yet consumed
+        self.condition = threading.Condition()
+        self.server = None
+
+    def start(self):
+        """
+        Start the HTTP receiver, in a background thread
+        :return: the receiver local URL
+        """
+        receiver = self
+
+        class EventHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('content-length', 0))
+                body = self.rfile.read(length)
+                if receiver.secret and not hmac.compare_digest(self.headers.get(SECRET_HEADER, ''), receiver.secret):
+                    self.send_response(401)
+                else:
+                    try:
+                        receiver.add_events(dnac_apis.json_loads(body))
+                        self.send_response(200)
+                    except ValueError:
+                        self.send_response(400)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), EventHandler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]  # the port selected, if started with port 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return 'http://127.0.0.1:' + str(self.port) + '/events'
+
+    def stop(self):
+        """
+        Stop the HTTP receiver
+        :return: none
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def subscribe(self, dnac_jwt_token, receiver_url=EVENT_RECEIVER_URL, event_ids=EVENT_IDS,
+                  subscription_name=EVENT_SUBSCRIPTION_NAME):
+        """
+        Subscribe to the Cisco DNA Center events notifications, sent to this receiver. The webhook destination and the
+        REST subscription with the name {subscription_name} are reused, updated if the receiver URL, the secret header
+        or the events ids changed, and created if not found.
+        :param dnac_jwt_token: Cisco DNA Center token
+        :param receiver_url: the receiver URL, as reachable from Cisco DNA Center
+        :param event_ids: list of the events ids reporting the deployments and tasks completion
+        :param subscription_name: subscription and webhook destination name
+        :return: True if subscribed, False if the subscription failed
+        """
+        if not event_ids:
+            print('\nUnable to subscribe to the events notifications, no events ids configured')
+            return False
+        headers = {SECRET_HEADER: self.secret} if self.secret else {}
+        try:
+            webhook = find_by_name(dnac_apis.get_webhook_destinations(dnac_jwt_token), subscription_name)
+            if webhook is None:
+                status_code = dnac_apis.create_webhook_destination(subscription_name, receiver_url, dnac_jwt_token,
+                                                                   headers)
+                if not check_status(status_code, 'webhook destination', subscription_name, 'created'):
+                    return False
+                webhook = find_by_name(dnac_apis.get_webhook_destinations(dnac_jwt_token), subscription_name)
+                if webhook is None:
+                    print('\nUnable to find the webhook destination "' + subscription_name + '"')
+                    return False
+            elif not webhook_matches(webhook, receiver_url, headers):
+                status_code = dnac_apis.update_webhook_destination(webhook['webhookId'], subscription_name,
+                                                                   receiver_url, dnac_jwt_token, headers)
+                if not check_status(status_code, 'webhook destination', subscription_name, 'updated'):
+                    return False
+
+            webhook_id = webhook['webhookId']
+            subscription = find_by_name(dnac_apis.get_event_subscriptions(dnac_jwt_token), subscription_name)
+            if subscription is None:
+                status_code = dnac_apis.create_event_subscription(subscription_name, event_ids, webhook_id,
+                                                                  dnac_jwt_token)
+                return check_status(status_code, 'events subscription', subscription_name, 'created')
+            if not subscription_matches(subscription, webhook_id, event_ids):
+                status_code = dnac_apis.update_event_subscription(subscription['subscriptionId'], subscription_name,
+                                                                  event_ids, webhook_id, dnac_jwt_token)
+                return check_status(status_code, 'events subscription', subscription_name, 'updated')
+        except (requests.RequestException, ValueError, KeyError) as error:
+            print('\nUnable to subscribe to the events notifications, ', repr(error))
+            return False
+        print('\nThe events subscription "' + subscription_name + '" found')
+        return True
+
+    def expect(self, ids):
+        """
+        Register the deployment or task ids to wait for, call it when the deployment or task is started, to not
+        miss the events received before the wait starts
+        :param ids: list of deployment or task ids
+        :return: none
+        """
+        with self.condition:
+            self.pending.update(ids)
+
+    def add_events(self, events):
+        """
+        Record the expected deployments and tasks completed, reported by one or a list of events notifications, and
+        wake up the waits
+        :param events: event notification, or list of events notifications
+        :return: none
+        """
+        if not isinstance(events, list):
+            events = [events]
+        with self.condition:
+            for event in events:
+                if isinstance(event, dict):
+                    for completion_id, status in parse_event(event):
+                        if completion_id in self.pending:
+                            self.completed[completion_id] = status
+            self.condition.notify_all()
+
+    def wait(self, ids, get_status, timeout=EVENT_WAIT_TIMEOUT, poll_interval=EVENT_POLL_INTERVAL,
+             use_event_status=False):
+        """
+        Wait for the deployments or tasks with the ids {ids} to be completed. The status is checked once, when the
+        event is received. The ids not reported by events are polled every {poll_interval} seconds.
+        :param ids: list of deployment or task ids
+        :param get_status: function to check once the status for an id, returns none if not completed
+        :param timeout: maximum wait, seconds
+        :param poll_interval: polling interval for the ids not reported by events, seconds
+        :param use_event_status: use the final status included in the event, if any, without checking it
+        :return: dictionary {id: status, or none if not completed before the timeout}
+        """
+        self.expect(ids)
+        results = {}
+        remaining = set(ids)
+        deadline = time.time() + timeout
+        next_poll = time.time() + poll_interval
+        while remaining:
+            with self.condition:
+                reported = [[completion_id, self.completed.pop(completion_id)] for completion_id in remaining
+                            if completion_id in self.completed]
+            for completion_id, status in reported:
+                if status is None or not use_event_status:
+                    status = get_status(completion_id)
+                if status is not None:
+                    results[completion_id] = status
+                    remaining.discard(completion_id)
+            if not remaining:
+                break
+            now = time.time()
+            if now >= next_poll:
+                for completion_id in list(remaining):
+                    status = get_status(completion_id)
+                    if status is not None:
+                        results[completion_id] = status
+                        remaining.discard(completion_id)
+                next_poll = now + poll_interval
+            if not remaining or now >= deadline:
+                break
+            with self.condition:
+                if not any(completion_id in self.completed for completion_id in remaining):
+                    self.condition.wait(min(next_poll, deadline) - now)
+        with self.condition:
+            for completion_id in ids:
+                self.pending.discard(completion_id)
+                self.completed.pop(completion_id, None)
+        for completion_id in remaining:
+            results[completion_id] = None
+        return results
+
+    def wait_for_deployments(self, depl_task_ids, dnac_jwt_token, timeout=EVENT_WAIT_TIMEOUT,
+                             poll_interval=EVENT_POLL_INTERVAL):
+        """
+        Wait for the templates deployments with the ids {depl_task_ids} to be completed
+        :param depl_task_ids: list of template deployment ids
+        :param dnac_jwt_token: Cisco DNA Center token
+        :param timeout: maximum wait, seconds
+        :param poll_interval: polling interval for the deployments not reported by events, seconds
+        :return: dictionary {deployment id: status - {SUCCESS} or {FAILURE}, or {unknown}}
+        """
+        def get_status(depl_task_id):
+            status = dnac_apis.get_template_deployment_status(depl_task_id, dnac_jwt_token)
+            return None if status == 'unknown' else status
+
+        results = self.wait(depl_task_ids, get_status, timeout, poll_interval)
+        return {depl_task_id: status or 'unknown' for depl_task_id, status in results.items()}
+
+    def wait_for_deployment(self, depl_task_id, dnac_jwt_token, timeout=EVENT_WAIT_TIMEOUT,
+                            poll_interval=EVENT_POLL_INTERVAL):
+        """
+        Wait for the template deployment with the id {depl_task_id} to be completed, same as
+        dnac_apis.check_template_deployment_status
+        :param depl_task_id: template deployment id
+        :param dnac_jwt_token: Cisco DNA Center token
+        :param timeout: maximum wait, seconds
+        :param poll_interval: polling interval if the deployment is not reported by events, seconds
+        :return: status - {SUCCESS} or {FAILURE}, or {unknown}
+        """
+        return self.wait_for_deployments([depl_task_id], dnac_jwt_token, timeout, poll_interval)[depl_task_id]
+
+    def wait_for_tasks(self, task_ids, dnac_jwt_token, timeout=EVENT_WAIT_TIMEOUT, poll_interval=EVENT_POLL_INTERVAL):
+        """
+        Wait for the tasks with the ids {task_ids} to be completed. The task status is always collected from Cisco DNA
+        Center, once the completion is reported.
+        :param task_ids: list of task ids
+        :param dnac_jwt_token: Cisco DNA Center token
+        :param timeout: maximum wait, seconds
+        :param poll_interval: polling interval for the tasks not reported by events, seconds
+        :return: dictionary {task id: task status, same as dnac_apis.check_task_id_status, or none}
+        """
+        return self.wait(task_ids, lambda task_id: dnac_apis.get_task_id_status(task_id, dnac_jwt_token),
+                         timeout, poll_interval)
+
+
+def find_by_name(items, name):
+    """
+    Find the webhook destination or the subscription with the name {name}
+    :param items: list of webhook destinations or subscriptions
+    :param name: name
+    :return: the webhook destination or subscription, or none
+    """
+    for item in items:
+        if item.get('name') == name:
+            return item
+    return None
+
+
+def webhook_matches(webhook, receiver_url, headers):
+    """
+    Check if the webhook destination sends the events notifications to {receiver_url}, with the HTTP headers {headers}
+    :param webhook: webhook destination
+    :param receiver_url: the receiver URL
+    :param headers: dictionary of the HTTP headers
+    :return: True if matching
+    """
+    webhook_headers = {header.get('name'): header.get('value') for header in webhook.get('headers') or []}
+    return webhook.get('url') == receiver_url and webhook_headers == headers
+
+
+def subscription_matches(subscription, webhook_id, event_ids):
+    """
+    Check if the subscription sends the notifications for the events {event_ids}, only to the webhook destination
+    with the id {webhook_id}
+    :param subscription: events subscription
+    :param webhook_id: webhook destination id
+    :param event_ids: list of event ids
+    :return: True if matching
+    """
+    instance_ids = [endpoint.get('instanceId') or (endpoint.get('subscriptionDetails') or {}).get('instanceId')
+                    for endpoint in subscription.get('subscriptionEndpoints') or []]
+    subscription_event_ids = (subscription.get('filter') or {}).get('eventIds') or []
+    return instance_ids == [webhook_id] and sorted(subscription_event_ids) == sorted(event_ids)
+
+
+def check_status(status_code, object_type, name, action):
+    """
+    Print the result of a webhook destination or subscription create or update API call
+    :param status_code: response status code
+    :param object_type: 'webhook destination' or 'events subscription'
+    :param name: name
+    :param action: 'created' or 'updated'
+    :return: True for a 2xx status code
+    """
+    if not 200 <= status_code < 300:
+        print('\nUnable to subscribe to the events notifications, the ' + object_type + ' "' + name + '" was not ' +
+              action + ', response status code: ', status_code)
+        return False
+    print('\nThe ' + object_type + ' "' + name + '" ' + action)
+    return True
+
+
+def post_event(receiver_url, event, secret=None):
+    """
+    Send an event notification to the receiver, same as Cisco DNA Center. Used to test the receiver with a local
+    stand-in for Cisco DNA Center.
+    :param receiver_url: the receiver URL
+    :param event: event notification, or list of events notifications
+    :param secret: the shared secret, or none
+    :return: response status code
+    """
+    header = {'content-type': 'application/json'}
+    if secret:
+        header[SECRET_HEADER] = secret
+    response = requests.post(receiver_url, data=json.dumps(event), headers=header)
+    return response.status_code
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Streaming Pipeline Stages
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2020 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import queue
+import threading
+
+
+END = None  # the marker put in a queue by a stage when there are no more items
+
+
+def start_source(items_function, out_queue, out_workers=1, stop_event=None, errors=None):
+    """
+    Start a thread putting the items returned by {items_function} in {out_queue}. The queue is bounded, the thread
+    waits when the queue is full. When all the items are processed, or {stop_event} is set, one end marker for each
+    of the next stage threads is put in the queue. An error stops the source, and is added to {errors}.
+    :param items_function: function returning an iterable of items, ex. a generator
+    :param out_queue: output queue
+    :param out_workers: number of threads of the next stage
+    :param stop_event: threading.Event to stop before all items are processed, or none
+    :param errors: list collecting the errors [[stage, item, error],...], or none
+    :return: the thread
+    """
+    def run():
+        try:
+            for item in items_function():
+                if stop_event is not None and stop_event.is_set():
+                    break
+                out_queue.put(item)
+        except Exception as error:
+            print('\nPipeline source stopped, error: ', repr(error))
+            if errors is not None:
+                errors.append(['source', '', repr(error)])
+        for index in range(out_workers):
+            out_queue.put(END)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def start_stage(worker, in_queue, out_queue, workers=1, out_workers=1, errors=None):
+    """
+    Start {workers} threads processing the items from {in_queue}, with the function {worker}(item, put). The worker
+    may call put(new_item) any number of times, to send items to {out_queue}. Errors processing an item are printed
+    and added to {errors}, and the stage continues with the next item. When all the threads received the end marker,
+    one end marker for each of the next stage threads is put in {out_queue}.
+    :param worker: function processing one item
+    :param in_queue: input queue
+    :param out_queue: output queue
+    :param workers: number of threads
+    :param out_workers: number of threads of the next stage
+    :param errors: list collecting the errors [[stage, item, error],...], or none
+    :return: list of threads
+    """
+    def run():
+        while True:
+            item = in_queue.get()
+            if item is END:
+                return
+            try:
+                worker(item, out_queue.put)
+            except Exception as error:
+                print('\nPipeline stage error for the item: ', item, ', ', repr(error))
+                if errors is not None:
+                    errors.append([worker.__name__, item, repr(error)])
+
+    def close():
+        for thread in threads:
+            thread.join()
+        for index in range(out_workers):
+            out_queue.put(END)
+
+    threads = [threading.Thread(target=run, daemon=True) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    threading.Thread(target=close, daemon=True).start()
+    return threads
+
+
+def iter_queue(in_queue, workers=1):
+    """
+    Yield the items from {in_queue}, until {workers} end markers are received
+    :param in_queue: input queue
+    :param workers: the number of end markers expected, the {out_workers} of the previous stage
+    :return: generator of items
+    """
+    ended = 0
+    while ended < workers:
+        item = in_queue.get()
+        if item is END:
+            ended += 1
+        else:
+            yield item
+
+
+def bounded_queue(size):
+    """
+    Create a queue between two stages. The size bounds the memory used, and slows down the faster stage.
+    :param size: maximum number of items in the queue
+    :return: the queue
+    """
+    return queue.Queue(maxsize=size)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Cisco DNA Center Templates Catalog
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2020 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import datetime
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import dnac_apis
+from config import CATALOG_FILE, CATALOG_WORKERS
+
+
+def empty_catalog():
+    """
+    Create an empty templates catalog
+    :return: catalog with no projects and templates
+    """
+    catalog = {
+        'projects': {},
+        'templates': {},
+        'refreshTime': ''
+    }
+    index_catalog(catalog)
+    return catalog
+
+
+def index_catalog(catalog):
+    """
+    Build the in memory indexes used for the name and version lookups. The indexes are not saved to file.
+    :param catalog: templates catalog
+    :return: none
+    """
+    project_names = {}
+    template_names = {}
+    version_ids = {}
+    for project in catalog['projects'].values():
+        project_names[project['name']] = project['id']
+    for template in catalog['templates'].values():
+        template_names[(template['projectName'], template['name'])] = template['id']
+        for version in template['versions']:
+            version_ids[version['id']] = template['id']
+    catalog['index'] = {
+        'projectNames': project_names,
+        'templateNames': template_names,
+        'versionIds': version_ids
+    }
+
+
+def load_catalog(file_name=CATALOG_FILE):
+    """
+    Load the templates catalog saved by a previous run
+    :param file_name: catalog file name
+    :return: templates catalog, empty if the file does not exist
+    """
+    if not os.path.exists(file_name):
+        return empty_catalog()
+    with open(file_name, 'rb') as catalog_file:
+        catalog = dnac_apis.json_loads(catalog_file.read())
+    index_catalog(catalog)
+    return catalog
+
+
+def save_catalog(catalog, file_name=CATALOG_FILE):
+    """
+    Save the templates catalog to file. The file is replaced only after it is completely written.
+    :param catalog: templates catalog
+    :param file_name: catalog file name
+    :return: none
+    """
+    catalog_data = {
+        'projects': catalog['projects'],
+        'templates': catalog['templates'],
+        'refreshTime': catalog['refreshTime']
+    }
+    temp_file_name = file_name + '.tmp'
+    with open(temp_file_name, 'w') as catalog_file:
+        json.dump(catalog_data, catalog_file)
+    os.replace(temp_file_name, file_name)
+
+
+def template_fingerprint(template_info):
+    """
+    Create the value used to identify if a template changed, from the info returned when listing all templates:
+    the ids and times of all committed versions, and the last update time, if included
+    :param template_info: template info, from the list of all templates
+    :return: template fingerprint
+    """
+    versions = sorted((version.get('id', ''), str(version.get('versionTime', '')))
+                      for version in template_info.get('versionsInfo') or [])
+    return json.dumps([versions, str(template_info.get('lastUpdateTime', ''))])
+
+
+def catalog_template(template_info, template_details, fingerprint):
+    """
+    Create the catalog entry for a template
+    :param template_info: template info, from the list of all templates
+    :param template_details: template details, including the content and params
+    :param fingerprint: template fingerprint
+    :return: catalog template entry
+    """
+    versions = []
+    for version in template_info.get('versionsInfo') or []:
+        versions.append({
+            'id': version.get('id', ''),
+            'version': str(version.get('version', '')),
+            'versionTime': version.get('versionTime', 0),
+            'versionComment': version.get('versionComment', '')
+        })
+    versions.sort(key=lambda version: version['versionTime'])
+    return {
+        'id': template_info['templateId'],
+        'name': template_info['name'],
+        'projectId': template_info['projectId'],
+        'projectName': template_info['projectName'],
+        'fingerprint': fingerprint,
+        'versions': versions,
+        'lastUpdateTime': template_details.get('lastUpdateTime', ''),
+        'templateContent': template_details.get('templateContent', ''),
+        'templateParams': template_details.get('templateParams') or []
+    }
+
+
+def catalog_project(project_info):
+    """
+    Create the catalog entry for a project
+    :param project_info: project info, from the list of all projects
+    :return: catalog project entry
+    """
+    return {
+        'id': project_info['id'],
+        'name': project_info['name'],
+        'createTime': project_info.get('createTime', ''),
+        'lastUpdateTime': project_info.get('lastUpdateTime', ''),
+        'templateIds': [template['id'] for template in project_info.get('templates') or []]
+    }
+
+
+def refresh_catalog(dnac_jwt_token, file_name=CATALOG_FILE):
+    """
+    This function will refresh the local templates catalog and save it to file.
+    The list of all projects and the list of all templates are retrieved, and the template details are retrieved only
+    for the new templates, and for those templates with versions or last update time changed since the previous
+    refresh. Deleted templates and projects are removed from the catalog.
+    If the lists or the details can't be retrieved, the catalog saved by the previous refresh is returned, unchanged,
+    and the caller decides if the previous catalog may be used.
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param file_name: catalog file name
+    :return: the templates catalog, True if refreshed or False if this is the catalog saved by the previous refresh
+    """
+    catalog = load_catalog(file_name)
+    templates = catalog['templates']
+
+    try:
+        project_list = dnac_apis.get_all_project_info(dnac_jwt_token)
+
+        found_template_ids = set()
+        changed_templates = []
+        for template_info in dnac_apis.iter_all_template_info(dnac_jwt_token):
+            fingerprint = template_fingerprint(template_info)
+            template_id = template_info['templateId']
+            found_template_ids.add(template_id)
+            if template_id not in templates or templates[template_id]['fingerprint'] != fingerprint:
+                changed_templates.append((template_info, fingerprint))
+
+        # retrieve the details for the changed templates only
+        with ThreadPoolExecutor(max_workers=CATALOG_WORKERS) as executor:
+            details_list = list(executor.map(
+                lambda changed: dnac_apis.get_template_details(changed[0]['templateId'], dnac_jwt_token),
+                changed_templates))
+    except (requests.RequestException, ValueError, KeyError) as error:
+        print('\nUnable to refresh the templates catalog, using the catalog from: ', catalog['refreshTime'], ', ',
+              repr(error))
+        return catalog, False
+
+    for (template_info, fingerprint), template_details in zip(changed_templates, details_list):
+        templates[template_info['templateId']] = catalog_template(template_info, template_details, fingerprint)
+
+    deleted_template_ids = set(templates) - found_template_ids
+    for template_id in deleted_template_ids:
+        del templates[template_id]
+
+    catalog['projects'] = {project_info['id']: catalog_project(project_info) for project_info in project_list}
+    catalog['refreshTime'] = str(datetime.datetime.now().replace(microsecond=0))
+    index_catalog(catalog)
+    save_catalog(catalog, file_name)
+    print('\nTemplates catalog refreshed, ' + str(len(changed_templates)) + ' templates updated, ' +
+          str(len(deleted_template_ids)) + ' deleted, ' + str(len(templates)) + ' templates in catalog')
+    return catalog, True
+
+
+def get_project_id(catalog, project_name):
+    """
+    Find the id for the project with the name {project_name}
+    :param catalog: templates catalog
+    :param project_name: project name
+    :return: project id, or none
+    """
+    return catalog['index']['projectNames'].get(project_name)
+
+
+def get_template(catalog, template_id):
+    """
+    Find the catalog entry for the template with the id {template_id}, or for the template with the committed version
+    with the id {template_id}
+    :param catalog: templates catalog
+    :param template_id: template id, or template version id
+    :return: catalog template entry, or none
+    """
+    template = catalog['templates'].get(template_id)
+    if template is None:
+        template = catalog['templates'].get(catalog['index']['versionIds'].get(template_id))
+    return template
+
+
+def get_template_by_name(catalog, template_name, project_name):
+    """
+    Find the catalog entry for the template with the name {template_name}, part of the project {project_name}
+    :param catalog: templates catalog
+    :param template_name: template name
+    :param project_name: project name
+    :return: catalog template entry, or none
+    """
+    template_id = catalog['index']['templateNames'].get((project_name, template_name))
+    return catalog['templates'].get(template_id)
+
+
+def get_template_id(catalog, template_name, project_name):
+    """
+    Find the id for the template with the name {template_name}, part of the project {project_name}
+    :param catalog: templates catalog
+    :param template_name: template name
+    :param project_name: project name
+    :return: template id, or '' if not found, same as dnac_apis.get_template_id
+    """
+    template = get_template_by_name(catalog, template_name, project_name)
+    if template is None:
+        return ''
+    return template['id']
+
+
+def get_template_version(catalog, template_id, version):
+    """
+    Find the committed version {version} of the template with the id {template_id}
+    :param catalog: templates catalog
+    :param template_id: template id
+    :param version: version number, or 'latest'
+    :return: version info, including the version id, or none
+    """
+    template = get_template(catalog, template_id)
+    if template is None or not template['versions']:
+        return None
+    if version == 'latest':
+        return template['versions'][-1]
+    for version_info in template['versions']:
+        if version_info['version'] == str(version):
+            return version_info
+    return None
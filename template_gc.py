@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Cisco DNA Center Templates Clean Up
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2020 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import csv
+import datetime
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import urllib3
+from requests.auth import HTTPBasicAuth  # for Basic Auth
+from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
+
+import dnac_apis
+import template_catalog
+from config import DNAC_PASS, DNAC_USER
+from config import GC_PROJECTS, GC_KEEP_VERSIONS, GC_VERSION_MAX_AGE_DAYS, GC_TEMPLATE_MAX_AGE_DAYS
+from config import GC_DELETE_EMPTY_PROJECTS, GC_PROJECT_MIN_AGE_DAYS, GC_WORKERS, GC_DRY_RUN
+
+urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
+
+DNAC_AUTH = HTTPBasicAuth(DNAC_USER, DNAC_PASS)
+
+
+def age_days(timestamp, now):
+    """
+    Calculate the age of a Cisco DNA Center timestamp
+    :param timestamp: epoch time, milliseconds
+    :param now: current epoch time, seconds
+    :return: the age in days, or none if the timestamp is not valid
+    """
+    try:
+        return (now - float(timestamp) / 1000) / 86400
+    except (TypeError, ValueError):
+        return None
+
+
+def is_stale(timestamp, max_age_days, now):
+    """
+    Check if a Cisco DNA Center timestamp is older than {max_age_days}. Invalid timestamps are never stale.
+    :param timestamp: epoch time, milliseconds
+    :param max_age_days: maximum age, days
+    :param now: current epoch time, seconds
+    :return: True if stale
+    """
+    age = age_days(timestamp, now)
+    return age is not None and age > max_age_days
+
+
+def find_stale_objects(catalog, now=None, project_names=GC_PROJECTS, keep_versions=GC_KEEP_VERSIONS,
+                       version_max_age_days=GC_VERSION_MAX_AGE_DAYS, template_max_age_days=GC_TEMPLATE_MAX_AGE_DAYS,
+                       delete_empty_projects=GC_DELETE_EMPTY_PROJECTS, project_min_age_days=GC_PROJECT_MIN_AGE_DAYS):
+    """
+    Find the stale templates versions, templates and projects, part of the projects {project_names}:
+     - the committed versions older than the latest {keep_versions}, and older than {version_max_age_days}
+     - the templates not updated for {template_max_age_days}
+     - the projects with no templates left, not updated for {project_min_age_days}
+    :param catalog: templates catalog
+    :param now: current epoch time, seconds, or none
+    :param project_names: list of the projects names to clean up
+    :param keep_versions: number of latest committed versions to keep for each template, minimum 1
+    :param version_max_age_days: minimum age of the versions to delete, days, or none
+    :param template_max_age_days: minimum age of the templates to delete, days, or none to keep all templates
+    :param delete_empty_projects: delete the projects with no templates left
+    :param project_min_age_days: minimum age of the empty projects to delete, days
+    :return: list of stale objects [[object type, project name, name, id, reason],...], the projects last
+    """
+    now = now or time.time()
+    keep_versions = max(1, keep_versions)
+    stale_objects = []
+    stale_template_ids = set()
+
+    for template in catalog['templates'].values():
+        if template['projectName'] not in project_names:
+            continue
+        versions = template['versions']
+        timestamps = [timestamp for timestamp in [template['lastUpdateTime']] + [version['versionTime']
+                      for version in versions] if age_days(timestamp, now) is not None]
+        last_update = max(timestamps, key=float) if timestamps else None
+        if template_max_age_days is not None and is_stale(last_update, template_max_age_days, now):
+            stale_template_ids.add(template['id'])
+            stale_objects.append(['template', template['projectName'], template['name'], template['id'],
+                                  'not updated for ' + str(int(age_days(last_update, now))) + ' days'])
+            continue
+        for version in versions[:-keep_versions]:
+            if version_max_age_days is None or is_stale(version['versionTime'], version_max_age_days, now):
+                stale_objects.append(['version', template['projectName'],
+                                      template['name'] + ' v' + version['version'], version['id'],
+                                      'older than the latest ' + str(keep_versions) + ' versions'])
+
+    if delete_empty_projects:
+        for project in catalog['projects'].values():
+            # the template ids are not known for the catalogs saved before they were included
+            if project['name'] not in project_names or project.get('templateIds') is None:
+                continue
+            remaining = [template_id for template_id in project['templateIds'] if template_id not in stale_template_ids]
+            last_update = project['lastUpdateTime'] or project['createTime']
+            if not remaining and is_stale(last_update, project_min_age_days, now):
+                stale_objects.append(['project', project['name'], project['name'], project['id'],
+                                      'no templates, not updated for ' + str(int(age_days(last_update, now))) +
+                                      ' days'])
+    return stale_objects
+
+
+def delete_stale_objects(stale_objects, dnac_jwt_token, workers=GC_WORKERS):
+    """
+    Delete the stale templates versions and templates, and after that the stale projects, with a pool of
+    {workers} parallel API calls. A project is deleted only if all its templates and versions deletes succeeded.
+    :param stale_objects: list of stale objects, from find_stale_objects
+    :param dnac_jwt_token: Cisco DNA Center token
+    :param workers: number of parallel delete API calls
+    :return: list of delete results [[object type, project name, name, id, response status code or 'SKIPPED'],...]
+    """
+    def delete_object(stale_object):
+        if stale_object[0] == 'project':
+            status_code = dnac_apis.delete_project_id(stale_object[3], dnac_jwt_token)
+        else:
+            status_code = dnac_apis.delete_template_id(stale_object[3], dnac_jwt_token)
+        return stale_object[:4] + [status_code]
+
+    templates_objects = [stale_object for stale_object in stale_objects if stale_object[0] != 'project']
+    projects_objects = [stale_object for stale_object in stale_objects if stale_object[0] == 'project']
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        delete_results = list(executor.map(delete_object, templates_objects))
+
+        # the projects are deleted only after all their templates are deleted
+        failed_projects = set(result[1] for result in delete_results if not is_success(result[4]))
+        delete_results += list(executor.map(delete_object, [stale_object for stale_object in projects_objects
+                                                            if stale_object[1] not in failed_projects]))
+    delete_results += [stale_object[:4] + ['SKIPPED'] for stale_object in projects_objects
+                       if stale_object[1] in failed_projects]
+    return delete_results
+
+
+def is_success(status_code):
+    """
+    Check if a delete API call succeeded
+    :param status_code: response status code
+    :return: True for a 2xx status code
+    """
+    return isinstance(status_code, int) and 200 <= status_code < 300
+
+
+def main():
+    """
+    This script will clean up the Cisco DNA Center projects {GC_PROJECTS}. Every run of the templates create or update
+    commits a new template version, and the projects accumulate a large number of versions.
+    The application will:
+     - refresh the local templates catalog, and stop if not refreshed and {GC_DRY_RUN} is False
+     - find the stale templates versions, templates and projects, based on the retention policy in the config file
+     - print the objects to delete, and stop if {GC_DRY_RUN} is True
+     - delete the objects, with a number of parallel API calls
+     - save the report to file
+    """
+
+    # the local date and time when the code will start execution
+
+    date_time = str(datetime.datetime.now().replace(microsecond=0))
+
+    print('\n\nApplication "template_gc.py" Run Started: ' + date_time)
+
+    # get a Cisco DNA Center auth token
+    dnac_auth = dnac_apis.get_dnac_jwt_token(DNAC_AUTH)
+
+    # refresh the local templates catalog, and find the stale objects. The catalog saved by a previous refresh may
+    # include templates updated since, and projects with new templates, the objects are not deleted using it
+    catalog, catalog_refreshed = template_catalog.refresh_catalog(dnac_auth)
+    if not catalog_refreshed:
+        if not GC_DRY_RUN:
+            print('\nUnable to refresh the templates catalog, no objects deleted')
+            return 1
+        print('\nWarning: dry run using the templates catalog from: ', catalog['refreshTime'])
+    stale_objects = find_stale_objects(catalog)
+
+    print('\nThe stale objects to delete are:\n')
+    for stale_object in stale_objects:
+        print(stale_object)
+    print('\nThe number of stale objects is: ', len(stale_objects))
+
+    if GC_DRY_RUN:
+        print('\nDry run, no objects deleted')
+        delete_results = [stale_object[:4] + ['DRY RUN'] for stale_object in stale_objects]
+    else:
+        delete_results = delete_stale_objects(stale_objects, dnac_auth)
+        failed_count = len([result for result in delete_results if not is_success(result[4])])
+        print('\nThe number of objects deleted is: ', len(delete_results) - failed_count, ', the number of errors is: ',
+              failed_count)
+
+        # refresh the local templates catalog, only the changed templates are retrieved
+        template_catalog.refresh_catalog(dnac_auth)
+
+    # save information to file
+    file_name = 'gc_report-' + date_time + '.csv'
+    file_name = file_name.replace(' ', '-')
+    with open(file_name, 'w', newline='') as output_file:
+        output_writer = csv.writer(output_file)
+        for result in delete_results:
+            output_writer.writerow(result)
+    print('\n\nFile ' + file_name + ' saved')
+
+    date_time = str(datetime.datetime.now().replace(microsecond=0))
+    print('\n\nEnd of Application "template_gc.py" Run: ' + date_time)
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
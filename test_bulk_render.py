@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the multi-process templates rendering in bulk_render.py
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import hashlib
+import os
+
+import bulk_render
+
+
+TEMPLATE_NAME = 'management_interface.j2'
+
+
+def test_bulk_render(tmp_path):
+    output_dir = str(tmp_path / 'rendered_configs')
+    cache_dir = str(tmp_path / 'cache')
+    device_params = [['SW-' + str(index), {'interface_number': str(index), 'ip_address': '10.0.0.' + str(index)}]
+                     for index in range(7)]
+    device_params.insert(3, ['SW-MISSING', {'interface_number': '3'}])
+    device_params.insert(5, ['../outside', {'interface_number': '5', 'ip_address': '10.0.0.5'}])
+
+    results = list(bulk_render.bulk_render(device_params, TEMPLATE_NAME, output_dir, cache_dir, workers=2,
+                                           chunk_size=2))
+
+    assert [result[0] for result in results] == [device[0] for device in device_params]
+    assert [file_name for file_name in os.listdir(cache_dir) if file_name.endswith('.cache')]
+    template = bulk_render.get_jinja_env(cache_dir).get_template(TEMPLATE_NAME)
+    for (hostname, parameters), (result_hostname, config_hash, error) in zip(device_params, results):
+        if hostname == 'SW-MISSING':
+            assert config_hash == '' and 'ip_address' in error
+        elif hostname == '../outside':
+            assert config_hash == '' and 'Invalid device hostname' in error
+        else:
+            assert error == ''
+            assert config_hash == hashlib.sha256(template.render(parameters).encode('utf-8')).hexdigest()
+            assert os.path.exists(os.path.join(output_dir, hostname + '.cfg'))
+    assert not os.path.exists(str(tmp_path / 'outside.cfg'))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the templates compliance check in compliance.py
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import compliance
+
+
+RUNNING_CONFIG = """!
+hostname PDX-RN
+!
+snmp-server community Public RO
+!
+interface Loopback101
+ description Management  Interface
+ ip address 101.100.100.100 255.255.255.255
+!
+router ospf 1
+ network 10.0.0.0 0.255.255.255 area 0
+!
+end
+"""
+
+
+def test_parse_running_config():
+    sections = compliance.parse_running_config(RUNNING_CONFIG)
+    assert sections['interface Loopback101'] == {'description Management Interface',
+                                                 'ip address 101.100.100.100 255.255.255.255'}
+    assert sections['hostname PDX-RN'] == set()
+    assert '!' not in sections and '' not in sections
+
+
+def test_compliant_sub_commands_without_indentation():
+    rendered_config = """! management interface
+interface Loopback101
+description Management Interface
+ip address 101.100.100.100 255.255.255.255
+exit
+"""
+    assert compliance.missing_config_lines(rendered_config, RUNNING_CONFIG) == []
+
+
+def test_exit_and_end_leave_the_section():
+    # after "exit", the network command is looked up at the top level, not in the interface section
+    rendered_config = """interface Loopback101
+ip address 101.100.100.100 255.255.255.255
+exit
+network 10.0.0.0 0.255.255.255 area 0
+end
+"""
+    assert compliance.missing_config_lines(rendered_config, RUNNING_CONFIG) == ['network 10.0.0.0 0.255.255.255 area 0']
+
+
+def test_missing_parent_section():
+    rendered_config = """interface Loopback102
+ ip address 102.100.100.100 255.255.255.255
+"""
+    assert compliance.missing_config_lines(rendered_config, RUNNING_CONFIG) == [
+        'interface Loopback102', 'ip address 102.100.100.100 255.255.255.255']
+
+
+def test_values_differing_in_case_are_missing():
+    rendered_config = """snmp-server community public RO
+interface Loopback101
+ description management interface
+"""
+    assert compliance.missing_config_lines(rendered_config, RUNNING_CONFIG) == [
+        'snmp-server community public RO', 'description management interface']
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the JSON streaming parser in dnac_apis.py
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import io
+import json
+
+import pytest
+import requests
+
+import dnac_apis
+
+
+BODIES = [
+    [1.5, 2, -3e-2, 1E+3, 0, True, False, None, "s", "é \\u00e9 \" ]", [], {}],
+    [{"id": "1", "hostname": "sw1", "tags": [1, 2.25, {"a": "]"}]}, {"id": "2", "hostname": "sw2"}],
+    [],
+]
+
+
+def split_chunks(body, chunk_size):
+    return [body[index:index + chunk_size] for index in range(0, len(body), chunk_size)]
+
+
+class FakeResponse(object):
+    """
+    Streamed API call response, with the body split in chunks
+    """
+
+    def __init__(self, body, status_code=200, chunk_size=7):
+        self.body = body
+        self.status_code = status_code
+        self.chunk_size = chunk_size
+        self.raw = io.BytesIO(body)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def iter_content(self, chunk_size=1):
+        return iter(split_chunks(self.body, self.chunk_size))
+
+
+@pytest.mark.parametrize('items', BODIES)
+def test_stdlib_array_chunk_boundaries(items):
+    body = json.dumps(items, ensure_ascii=False).encode('utf-8')
+    for chunk_size in range(1, len(body) + 1):
+        assert list(dnac_apis._iter_json_array_stdlib(split_chunks(body, chunk_size), None)) == json.loads(body)
+
+
+@pytest.mark.parametrize('items', BODIES)
+def test_stdlib_keyed_array_chunk_boundaries(items):
+    body = json.dumps({"version": 1.0, "meta": {"response": [0]}, "response": items, "last": "x"}).encode('utf-8')
+    for chunk_size in range(1, len(body) + 1):
+        result = list(dnac_apis._iter_json_array_stdlib(split_chunks(body, chunk_size), 'response'))
+        assert result == json.loads(body)['response']
+
+
+def test_stdlib_number_split_after_dot():
+    assert list(dnac_apis._iter_json_array_stdlib([b'[1.', b'5, 2]'], None)) == [1.5, 2]
+    assert list(dnac_apis._iter_json_array_stdlib([b'[1e', b'3, 2', b'0]'], None)) == [1000.0, 20]
+
+
+@pytest.mark.parametrize('body', [b'{"error": "Unauthorized"}', b'{"response": {"errorCode": "NCND01"}}', b'{}'])
+def test_stdlib_missing_array_raises(body):
+    with pytest.raises(ValueError):
+        list(dnac_apis._iter_json_array_stdlib([body], 'response'))
+
+
+def test_stdlib_top_level_not_array_raises():
+    with pytest.raises(ValueError):
+        list(dnac_apis._iter_json_array_stdlib([b'{"response": []}'], None))
+
+
+@pytest.mark.parametrize('use_ijson', [False, True])
+def test_iter_json_array(monkeypatch, use_ijson):
+    if use_ijson:
+        pytest.importorskip('ijson')
+    else:
+        monkeypatch.setattr(dnac_apis, 'ijson', None)
+    body = json.dumps({"response": BODIES[1], "version": "1.0"}).encode('utf-8')
+    assert list(dnac_apis.iter_json_array(FakeResponse(body), 'response')) == BODIES[1]
+    with pytest.raises(ValueError):
+        list(dnac_apis.iter_json_array(FakeResponse(b'{"response": {"errorCode": "NCND01"}}'), 'response'))
+    with pytest.raises(ValueError):
+        list(dnac_apis.iter_json_array(FakeResponse(b'{"error": "Unauthorized"}'), 'response'))
+
+
+def test_iter_json_array_http_error():
+    with pytest.raises(requests.HTTPError):
+        list(dnac_apis.iter_json_array(FakeResponse(b'{"error": "Unauthorized"}', status_code=401), 'response'))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the events notifications receiver in event_receiver.py, with a local stand-in for Cisco DNA Center
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import threading
+import time
+
+import pytest
+
+import dnac_apis
+import event_receiver
+
+
+@pytest.fixture
+def receiver():
+    completion_receiver = event_receiver.CompletionReceiver(host='127.0.0.1', port=0, secret='s3cret')
+    completion_receiver.url = completion_receiver.start()
+    yield completion_receiver
+    completion_receiver.stop()
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    """
+    Stand-in for the Cisco DNA Center deployment status API, the deployments in {completed} are completed
+    """
+    state = {'completed': {}, 'calls': []}
+
+    def get_template_deployment_status(depl_task_id, dnac_jwt_token):
+        state['calls'].append(depl_task_id)
+        return state['completed'].get(depl_task_id, 'unknown')
+
+    monkeypatch.setattr(dnac_apis, 'get_template_deployment_status', get_template_deployment_status)
+    return state
+
+
+def emit_later(delay, function):
+    timer = threading.Timer(delay, function)
+    timer.start()
+    return timer
+
+
+def test_event_resolves_wait_early(receiver, controller):
+    def complete():
+        controller['completed']['d1'] = 'SUCCESS'
+        event = {'eventId': 'TEMPLATE-DEPLOY', 'details': {'deploymentId': 'Template Deployment Id: d1'}}
+        assert event_receiver.post_event(receiver.url, event, 's3cret') == 200
+
+    emit_later(0.2, complete)
+    start_time = time.time()
+    results = receiver.wait_for_deployments(['d1'], 'token', timeout=10, poll_interval=10)
+    assert results == {'d1': 'SUCCESS'}
+    assert time.time() - start_time < 5
+    assert controller['calls'] == ['d1']  # one confirmation call, no polling
+
+
+def test_polling_fallback(receiver, controller):
+    controller['completed']['d2'] = 'FAILURE'
+    results = receiver.wait_for_deployments(['d2', 'd3'], 'token', timeout=1.5, poll_interval=0.5)
+    assert results == {'d2': 'FAILURE', 'd3': 'unknown'}
+
+
+def test_event_status_is_confirmed(receiver, controller):
+    # the event reports SUCCESS, the controller reports the deployment is still running
+    emit_later(0.2, lambda: event_receiver.post_event(receiver.url, {'deploymentId': 'd4', 'status': 'SUCCESS'},
+                                                      's3cret'))
+    results = receiver.wait_for_deployments(['d4'], 'token', timeout=1, poll_interval=10)
+    assert results == {'d4': 'unknown'}
+
+
+def test_events_without_secret_or_not_pending_are_ignored(receiver, controller):
+    assert event_receiver.post_event(receiver.url, {'deploymentId': 'd5'}) == 401
+    assert event_receiver.post_event(receiver.url, {'deploymentId': 'other'}, 's3cret') == 200
+    assert receiver.completed == {}
+
+
+def test_parse_event_final_status_only():
+    assert event_receiver.parse_event({'taskId': 't1', 'status': 'IN_PROGRESS'}) == [['t1', None]]
+    assert event_receiver.parse_event({'details': {'deploymentId': 'd1', 'status': 'success'}}) == [['d1', 'SUCCESS']]
+
+
+@pytest.fixture
+def subscriptions(monkeypatch):
+    """
+    Stand-in for the Cisco DNA Center webhook destinations and events subscriptions APIs
+    """
+    state = {'webhooks': [], 'subscriptions': [], 'calls': []}
+
+    def create_webhook_destination(name, url, token, headers=None):
+        state['calls'].append('create webhook')
+        state['webhooks'].append({'webhookId': 'w1', 'name': name, 'url': url,
+                                  'headers': [{'name': key, 'value': value} for key, value in headers.items()]})
+        return 200
+
+    def update_webhook_destination(webhook_id, name, url, token, headers=None):
+        state['calls'].append('update webhook')
+        return 200
+
+    def create_event_subscription(name, event_ids, webhook_id, token):
+        state['calls'].append('create subscription')
+        return 202
+
+    def update_event_subscription(subscription_id, name, event_ids, webhook_id, token):
+        state['calls'].append('update subscription')
+        return 500
+
+    monkeypatch.setattr(dnac_apis, 'get_webhook_destinations', lambda token: state['webhooks'])
+    monkeypatch.setattr(dnac_apis, 'get_event_subscriptions', lambda token: state['subscriptions'])
+    monkeypatch.setattr(dnac_apis, 'create_webhook_destination', create_webhook_destination)
+    monkeypatch.setattr(dnac_apis, 'update_webhook_destination', update_webhook_destination)
+    monkeypatch.setattr(dnac_apis, 'create_event_subscription', create_event_subscription)
+    monkeypatch.setattr(dnac_apis, 'update_event_subscription', update_event_subscription)
+    return state
+
+
+def test_subscribe_requires_event_ids(subscriptions):
+    receiver = event_receiver.CompletionReceiver(secret='s3cret')
+    assert not receiver.subscribe('token', 'http://receiver/events', [], 'test')
+    assert subscriptions['calls'] == []
+
+
+def test_subscribe_creates_then_reuses(subscriptions):
+    receiver = event_receiver.CompletionReceiver(secret='s3cret')
+    assert receiver.subscribe('token', 'http://receiver/events', ['E1'], 'test')
+    assert subscriptions['calls'] == ['create webhook', 'create subscription']
+
+    subscriptions['calls'] = []
+    subscriptions['subscriptions'].append({'subscriptionId': 's1', 'name': 'test', 'filter': {'eventIds': ['E1']},
+                                           'subscriptionEndpoints': [{'instanceId': 'w1'}]})
+    assert receiver.subscribe('token', 'http://receiver/events', ['E1'], 'test')
+    assert subscriptions['calls'] == []
+
+
+def test_subscribe_updates_changed_config(subscriptions):
+    subscriptions['webhooks'].append({'webhookId': 'w1', 'name': 'test', 'url': 'http://old/events', 'headers': []})
+    subscriptions['subscriptions'].append({'subscriptionId': 's1', 'name': 'test', 'filter': {'eventIds': ['E1']},
+                                           'subscriptionEndpoints': [{'instanceId': 'w1'}]})
+    receiver = event_receiver.CompletionReceiver(secret='s3cret')
+    # the subscription update fails, the deployments completion is checked by polling
+    assert not receiver.subscribe('token', 'http://receiver/events', ['E1', 'E2'], 'test')
+    assert subscriptions['calls'] == ['update webhook', 'update subscription']
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the streaming pipeline stages in pipeline.py, with the deploy_configs stages replaced by fake stages
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import threading
+import time
+
+import pipeline
+
+
+def run_pipeline(items_function, device_count, fail_index=None, stop_event=None):
+    """
+    Run the inventory, filter, check, deploy, status and report stages, same as deploy_configs, with small queues
+    and a different number of threads for each stage
+    """
+    device_queue = pipeline.bounded_queue(5)
+    check_queue = pipeline.bounded_queue(5)
+    deploy_queue = pipeline.bounded_queue(5)
+    status_queue = pipeline.bounded_queue(5)
+    report_queue = pipeline.bounded_queue(5)
+    selection = {'selected': 0}
+    errors = []
+
+    def filter_device(device, put):
+        if selection['selected'] >= device_count or device['type'] != 'switch':
+            return
+        put(device['index'])
+        selection['selected'] += 1
+        if stop_event is not None and selection['selected'] >= device_count:
+            stop_event.set()
+
+    def check_device(index, put):
+        if index % 10 == 0:
+            report_queue.put([index, 'COMPLIANT'])
+        else:
+            put(index)
+
+    def deploy_device(index, put):
+        if index == fail_index:
+            raise ValueError('deploy failed')
+        time.sleep(0.001 * (index % 3))
+        put(index)
+
+    def check_deployment(index, put):
+        put([index, 'SUCCESS'])
+
+    pipeline.start_source(items_function, device_queue, stop_event=stop_event, errors=errors)
+    pipeline.start_stage(filter_device, device_queue, check_queue, out_workers=3, errors=errors)
+    pipeline.start_stage(check_device, check_queue, deploy_queue, workers=3, out_workers=2, errors=errors)
+    pipeline.start_stage(deploy_device, deploy_queue, status_queue, workers=2, out_workers=4, errors=errors)
+    pipeline.start_stage(check_deployment, status_queue, report_queue, workers=4, errors=errors)
+    return list(pipeline.iter_queue(report_queue)), errors
+
+
+def devices(count):
+    for index in range(count):
+        yield {'index': index, 'type': 'switch' if index % 2 == 0 else 'router'}
+
+
+def test_pipeline_reports_all_selected_devices():
+    report, errors = run_pipeline(lambda: devices(300), device_count=150, fail_index=42)
+    assert sorted(item[0] for item in report) == [index for index in range(0, 300, 2) if index != 42]
+    assert sorted(item for item in report if item[1] == 'COMPLIANT') == [[index, 'COMPLIANT']
+                                                                        for index in range(0, 300, 10)]
+    assert errors == [['deploy_device', 42, "ValueError('deploy failed')"]]
+
+
+def test_pipeline_source_error():
+    def failing_devices():
+        for device in devices(20):
+            yield device
+        raise ConnectionError('inventory page not retrieved')
+
+    report, errors = run_pipeline(failing_devices, device_count=150)
+    assert sorted(item[0] for item in report) == list(range(0, 20, 2))
+    assert errors == [['source', '', "ConnectionError('inventory page not retrieved')"]]
+
+
+def test_pipeline_stop_event():
+    stop_event = threading.Event()
+    scanned = []
+
+    def scanned_devices():
+        for device in devices(10000):
+            scanned.append(device['index'])
+            yield device
+
+    report, errors = run_pipeline(scanned_devices, device_count=20, stop_event=stop_event)
+    assert sorted(item[0] for item in report) == list(range(0, 40, 2))
+    assert errors == []
+    assert len(scanned) < 100  # the inventory is not collected after all the devices are selected
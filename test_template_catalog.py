@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the local templates catalog in template_catalog.py
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import requests
+
+import dnac_apis
+import template_catalog
+
+
+PROJECTS = [
+    {'id': 'p1', 'name': 'project_1', 'createTime': 1, 'lastUpdateTime': 2, 'templates': [{'id': 't1', 'name': 'ntp'}]},
+    {'id': 'p2', 'name': 'empty_project', 'createTime': 3, 'lastUpdateTime': 4, 'templates': []}
+]
+TEMPLATES = [
+    {'templateId': 't1', 'name': 'ntp', 'projectId': 'p1', 'projectName': 'project_1',
+     'versionsInfo': [{'id': 'v1', 'version': 1, 'versionTime': 10}, {'id': 'v2', 'version': 2, 'versionTime': 20}]}
+]
+
+
+def fake_apis(monkeypatch, template_list, details_calls):
+    monkeypatch.setattr(dnac_apis, 'get_all_project_info', lambda token: PROJECTS)
+
+    def iter_all_template_info(token):
+        for template in template_list:
+            if isinstance(template, Exception):
+                raise template
+            yield template
+
+    def get_template_details(template_id, token):
+        details_calls.append(template_id)
+        return {'templateContent': 'ntp server {{ip}}', 'templateParams': [], 'lastUpdateTime': 20}
+
+    monkeypatch.setattr(dnac_apis, 'iter_all_template_info', iter_all_template_info)
+    monkeypatch.setattr(dnac_apis, 'get_template_details', get_template_details)
+
+
+def test_refresh_incremental(monkeypatch, tmp_path):
+    file_name = str(tmp_path / 'catalog.json')
+    details_calls = []
+    fake_apis(monkeypatch, TEMPLATES, details_calls)
+
+    catalog, refreshed = template_catalog.refresh_catalog('token', file_name)
+    assert refreshed
+    assert details_calls == ['t1']
+    assert template_catalog.get_template_id(catalog, 'ntp', 'project_1') == 't1'
+    assert template_catalog.get_project_id(catalog, 'empty_project') == 'p2'
+    assert template_catalog.get_template_version(catalog, 'v1', 'latest')['id'] == 'v2'
+
+    # no changes, the template details are not retrieved again
+    catalog, refreshed = template_catalog.refresh_catalog('token', file_name)
+    assert refreshed
+    assert details_calls == ['t1']
+    assert template_catalog.load_catalog(file_name)['projects']['p2']['templateIds'] == []
+
+
+def test_refresh_failure_keeps_catalog(monkeypatch, tmp_path):
+    file_name = str(tmp_path / 'catalog.json')
+    fake_apis(monkeypatch, TEMPLATES, [])
+    template_catalog.refresh_catalog('token', file_name)
+
+    fake_apis(monkeypatch, [requests.HTTPError('401')], [])
+    catalog, refreshed = template_catalog.refresh_catalog('token', file_name)
+    assert not refreshed
+    assert 't1' in catalog['templates']
+    assert 't1' in template_catalog.load_catalog(file_name)['templates']
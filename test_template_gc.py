@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+Tests for the templates clean up in template_gc.py
+
+Copyright (c) 2020 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+import pytest
+
+import dnac_apis
+import template_gc
+
+
+NOW = 1600000000.0
+DAY = 86400000
+
+
+def days_ago(days):
+    return NOW * 1000 - days * DAY
+
+
+def make_catalog():
+    versions = [{'id': 'v' + str(index), 'version': str(index), 'versionTime': days_ago(100 - index)}
+                for index in range(10)]
+    return {
+        'templates': {
+            't1': {'id': 't1', 'name': 'ntp', 'projectName': 'gc', 'lastUpdateTime': days_ago(91),
+                   'versions': versions}
+        },
+        'projects': {
+            'p1': {'id': 'p1', 'name': 'gc', 'createTime': days_ago(200), 'lastUpdateTime': days_ago(200),
+                   'templateIds': ['t1']},
+            'p2': {'id': 'p2', 'name': 'gc_new', 'createTime': days_ago(0.1), 'lastUpdateTime': days_ago(0.1),
+                   'templateIds': []},
+            'p3': {'id': 'p3', 'name': 'gc_old', 'createTime': days_ago(30), 'lastUpdateTime': days_ago(30),
+                   'templateIds': []},
+            'p4': {'id': 'p4', 'name': 'other', 'createTime': days_ago(30), 'lastUpdateTime': days_ago(30),
+                   'templateIds': []}
+        }
+    }
+
+
+def test_find_stale_versions_and_projects():
+    stale_objects = template_gc.find_stale_objects(make_catalog(), NOW, ['gc', 'gc_new', 'gc_old'], keep_versions=5,
+                                                   version_max_age_days=30, project_min_age_days=7)
+    assert [stale_object[3] for stale_object in stale_objects] == ['v0', 'v1', 'v2', 'v3', 'v4', 'p3']
+
+
+def test_find_stale_templates_empty_the_project():
+    stale_objects = template_gc.find_stale_objects(make_catalog(), NOW, ['gc'], template_max_age_days=60,
+                                                   project_min_age_days=7)
+    assert [stale_object[3] for stale_object in stale_objects] == ['t1', 'p1']
+
+
+def test_project_not_deleted_after_failed_template_delete(monkeypatch):
+    deleted_projects = []
+    monkeypatch.setattr(dnac_apis, 'delete_template_id', lambda template_id, token: 500)
+    monkeypatch.setattr(dnac_apis, 'delete_project_id',
+                        lambda project_id, token: deleted_projects.append(project_id) or 200)
+    stale_objects = template_gc.find_stale_objects(make_catalog(), NOW, ['gc', 'gc_old'], template_max_age_days=60,
+                                                   project_min_age_days=7)
+    results = template_gc.delete_stale_objects(stale_objects, 'token', workers=2)
+    assert deleted_projects == ['p3']
+    assert ['project', 'gc', 'gc', 'p1', 'SKIPPED'] in results
+
+
+def test_no_deletes_when_catalog_not_refreshed(monkeypatch):
+    monkeypatch.setattr(template_gc, 'GC_DRY_RUN', False)
+    monkeypatch.setattr(dnac_apis, 'get_dnac_jwt_token', lambda auth: 'token')
+    monkeypatch.setattr(template_gc.template_catalog, 'refresh_catalog', lambda token: (make_catalog(), False))
+    monkeypatch.setattr(template_gc, 'delete_stale_objects', lambda stale_objects, token: pytest.fail('deleted'))
+    assert template_gc.main() == 1